@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+
+BENCHMARKS = (
+    'startup',
+    'overhead',
+    'handshake',
+    'columns',
+    'decoder',
+    'codec',
+    'orderbook',
+)
+
+
+def main(names=None):
+    for name in names or BENCHMARKS:
+        module = importlib.import_module('bench.{}'.format(name))
+        module.main(args=[], standalone_mode=False)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Instrument codec CPU and Redis memory, binary against JSON
+
+Memory rows need a reachable Redis (REDIS_URI or --redis); keys are
+written under a bench: prefix and deleted afterwards.
+"""
+
+import click
+from redis.exceptions import RedisError
+
+from bench.common import configure, measure, report, usec
+from psyduck.agent import codec
+from psyduck.agent.distributor import Instrument
+from psyduck.redis import create_client
+
+CODECS = {
+    'binary': (codec.encode_binary, codec.decode_binary),
+    'json': (codec.encode_json, codec.decode_json),
+}
+
+
+def sample(n):
+    return [
+        Instrument('SYM{:03d}'.format(i), 6500.5 + i, 6500.0 + i,
+                   None if i % 10 == 0 else 6501.0 + i)
+        for i in range(n)
+    ]
+
+
+def redis_memory(redis, name, values):
+    keys = ['bench:{}:{}'.format(name, i) for i in range(len(values))]
+    pipe = redis.pipeline()
+    for key, value in zip(keys, values):
+        pipe.set(key, value, 60)
+    pipe.execute()
+    try:
+        pipe = redis.pipeline()
+        for key in keys:
+            pipe.execute_command('MEMORY', 'USAGE', key)
+        return sum(pipe.execute()) / len(keys)
+    finally:
+        redis.delete(*keys)
+
+
+@click.command()
+@click.option('--instruments', '-n', default=1000)
+@click.option('--redis', 'uri', help='Redis URI, defaults to REDIS_URI.')
+def main(instruments, uri):
+    items = sample(instruments)
+    config = configure(REDIS_URI=uri) if uri else configure()
+    redis = create_client(config)
+    for name, (encode, decode) in CODECS.items():
+        values = [encode(item) for item in items]
+        encoded = measure(lambda: [encode(item) for item in items], 1)
+        decoded = measure(lambda: [decode(value) for value in values], 1)
+        try:
+            memory = '{:.0f}B'.format(redis_memory(redis, name, values))
+        except RedisError as exc:
+            memory = 'skipped({})'.format(type(exc).__name__)
+        report(
+            'codec', name,
+            value='{:.1f}B'.format(sum(map(len, values)) / len(values)),
+            encode=usec(encoded['best'] / len(items)),
+            decode=usec(decoded['best'] / len(items)),
+            redis_per_key=memory,
+        )
+
+
+if __name__ == '__main__':
+    main()
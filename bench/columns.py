@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Memory and throughput of as_columns results against dict rows
+
+Every case starts from the raw trade response. `build`, `peak` and
+`retained` cover the JSON decode, plus the conversion for the columns cases,
+so the columns peak includes the decoded rows they are built from. The
+aggregate is a VWAP, from the dicts in Python and from the columns with
+numpy.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+
+import click
+
+from bench.common import measure, msec, report, trades
+from psyduck.client.columns import DATETIME, to_columns
+
+TRADE_TYPES = {
+    'timestamp': DATETIME,
+    'symbol': 'object',
+    'side': 'object',
+    'size': 'int64',
+    'price': 'float64',
+    'tickDirection': 'object',
+    'trdMatchID': 'object',
+    'grossValue': 'int64',
+    'homeNotional': 'float64',
+    'foreignNotional': 'float64',
+}
+
+
+def traced(build):
+    """Get (result, bytes retained, peak bytes) of running build"""
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, peak
+
+
+def timed(build):
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def vwap_rows(rows):
+    notional = volume = 0
+    for row in rows:
+        notional += row['price'] * row['size']
+        volume += row['size']
+    return notional / volume
+
+
+def vwap_columns(columns):
+    size = columns['size']
+    return float((columns['price'] * size).sum() / size.sum())
+
+
+@click.command()
+@click.option('--rows', '-n', default=100000, help='Trades to decode.')
+def main(rows):
+    body = json.dumps(trades(rows))
+    cases = [
+        ('dict rows', lambda: json.loads(body), vwap_rows),
+        ('columns typed', lambda: to_columns(
+            json.loads(body), TRADE_TYPES), vwap_columns),
+        ('columns inferred', lambda: to_columns(json.loads(body)),
+         vwap_columns),
+    ]
+    for name, build, vwap in cases:
+        data, size, peak = traced(build)
+        report('columns', name, rows=rows, build=msec(timed(build)),
+               peak_mib=peak / 2 ** 20, retained_mib=size / 2 ** 20,
+               vwap=msec(measure(lambda: vwap(data), 1, 3)['best']))
+
+
+if __name__ == '__main__':
+    main()
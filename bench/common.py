@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import cfg
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+TABLE_PARAMS = [
+    {'name': name, 'in': 'query', 'required': False, 'type': kind}
+    for name, kind in (
+        ('symbol', 'string'), ('filter', 'string'), ('columns', 'string'),
+        ('count', 'number'), ('start', 'number'), ('reverse', 'boolean'),
+        ('startTime', 'string'), ('endTime', 'string'),
+    )
+]
+
+
+def operation(operation_id, tag, parameters, definition):
+    return {'get': {
+        'operationId': operation_id,
+        'tags': [tag],
+        'parameters': parameters,
+        'responses': {'200': {'description': 'ok', 'schema': {
+            'type': 'array',
+            'items': {'$ref': '#/definitions/{}'.format(definition)},
+        }}},
+    }}
+
+
+def row_schema(**fields):
+    return {'type': 'object', 'properties': {
+        name: dict(zip(('type', 'format'), kind.split(':')))
+        for name, kind in fields.items()
+    }}
+
+
+# BitMEX-shaped subset of swagger.json covering the endpoints benchmarked
+SPEC = {
+    'swagger': '2.0',
+    'info': {'title': 'BitMEX API', 'version': '1.2.0'},
+    'basePath': '/api/v1',
+    'consumes': ['application/json'],
+    'produces': ['application/json'],
+    'paths': {
+        '/trade': operation('Trade.get', 'Trade', TABLE_PARAMS, 'Trade'),
+        '/instrument': operation(
+            'Instrument.get', 'Instrument', TABLE_PARAMS, 'Instrument'
+        ),
+        '/instrument/active': operation(
+            'Instrument.getActive', 'Instrument', [], 'Instrument'
+        ),
+        '/orderBook/L2': operation('OrderBook.getL2', 'OrderBook', [
+            {'name': 'symbol', 'in': 'query', 'required': True,
+             'type': 'string'},
+            {'name': 'depth', 'in': 'query', 'required': False,
+             'type': 'number'},
+        ], 'OrderBookL2'),
+    },
+    'definitions': {
+        'Trade': row_schema(
+            timestamp='string:date-time', symbol='string', side='string',
+            size='number:int64', price='number:double',
+            tickDirection='string', trdMatchID='string',
+            grossValue='number:int64', homeNotional='number:double',
+            foreignNotional='number:double',
+        ),
+        'OrderBookL2': row_schema(
+            symbol='string', id='number:int64', side='string',
+            size='number:int64', price='number:double',
+        ),
+        'Instrument': row_schema(
+            symbol='string', state='string', typ='string',
+            timestamp='string:date-time', lastPrice='number:double',
+            bidPrice='number:double', askPrice='number:double',
+            markPrice='number:double', openInterest='number:int64',
+            volume24h='number:int64', turnover24h='number:int64',
+        ),
+    },
+}
+
+START = datetime(2018, 8, 1)
+
+
+def trades(n):
+    return [{
+        'timestamp': (START + timedelta(milliseconds=i * 37)).strftime(
+            TIME_FORMAT),
+        'symbol': 'XBTUSD',
+        'side': 'Buy' if i % 3 else 'Sell',
+        'size': 100 + i % 900,
+        'price': 6500 + (i % 40) * 0.5,
+        'tickDirection': 'ZeroPlusTick',
+        'trdMatchID': '{:08x}-0000-0000-0000-{:012x}'.format(i, i),
+        'grossValue': 1538000 + i,
+        'homeNotional': 0.01538,
+        'foreignNotional': 100.0,
+    } for i in range(n)]
+
+
+def order_book(n, symbol='XBTUSD', mid=6500.0):
+    rows = []
+    for i in range(n):
+        side = 'Sell' if i < n // 2 else 'Buy'
+        offset = (n // 2 - i) if side == 'Sell' else (n // 2 - 1 - i)
+        price = mid + offset * 0.5
+        rows.append({
+            'symbol': symbol,
+            'id': level_id(price),
+            'side': side,
+            'size': 1000 + i * 7 % 5000,
+            'price': price,
+        })
+    return rows
+
+
+def level_id(price, index=88):
+    return int((100000000 * index) - price * 100)
+
+
+def instruments(n):
+    return [{
+        'symbol': 'SYM{:03d}'.format(i),
+        'state': 'Open',
+        'typ': 'FFWCSX',
+        'timestamp': START.strftime(TIME_FORMAT),
+        'lastPrice': 100.0 + i,
+        'bidPrice': 99.5 + i,
+        'askPrice': 100.5 + i,
+        'markPrice': 100.1 + i,
+        'openInterest': 1000000 + i,
+        'volume24h': 5000000 + i,
+        'turnover24h': 900000000 + i,
+    } for i in range(n)]
+
+
+PAYLOADS = {
+    'trade': lambda: trades(500),
+    'orderBookL2': lambda: order_book(500),
+    'instrument': lambda: instruments(100),
+}
+
+
+def load_payloads(directory=None):
+    """Get {name: raw JSON bytes}, recorded <name>.json files win
+
+    Recorded payloads are plain REST responses, eg: saved with
+    curl 'https://www.bitmex.com/api/v1/trade?count=500' > trade.json
+    """
+
+    payloads = {}
+    for name, build in PAYLOADS.items():
+        path = os.path.join(directory, name + '.json') if directory else None
+        if path and os.path.exists(path):
+            with open(path, mode='rb') as fp:
+                payloads[name] = fp.read()
+        else:
+            payloads[name] = json.dumps(build()).encode('utf-8')
+    return payloads
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super(StubHandler, self).setup()
+        # headers and body are separate writes, avoid the delayed-ACK stall
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        body = self.server.routes.get(path)
+        with self.server.lock:
+            self.server.requests += 1
+        etag = '"{:x}"'.format(zlib.crc32(body)) if body else None
+        if body is None:
+            self.send_response(404)
+            body = b'{"error": {"message": "Not Found"}}'
+        elif etag == self.headers.get('If-None-Match'):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        else:
+            self.send_response(200)
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """BitMEX stand-in on 127.0.0.1 serving fixed bodies by path"""
+
+    daemon_threads = True
+
+    def __init__(self, routes=None, spec=None):
+        super(StubServer, self).__init__(('127.0.0.1', 0), StubHandler)
+        self.routes = {'/api/explorer/swagger.json': spec or json.dumps(
+            SPEC).encode('utf-8')}
+        self.routes.update(routes or {})
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.thread = None
+
+    @property
+    def host(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        self.server_close()
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+
+
+def table_routes(payloads):
+    return {
+        '/api/v1/trade': payloads['trade'],
+        '/api/v1/orderBook/L2': payloads['orderBookL2'],
+        '/api/v1/instrument': payloads['instrument'],
+        '/api/v1/instrument/active': payloads['instrument'],
+    }
+
+
+def configure(**overrides):
+    """Override cfg.CONFIG for this process, eg: configure(HOST=...)"""
+
+    cfg.CONFIG.config.update(overrides)
+    return cfg.CONFIG
+
+
+def measure(fn, number=100, repeat=5):
+    """Get per-call seconds of `fn` as {best, median} over `repeat` runs"""
+
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - start) / number)
+    return {'best': min(runs), 'median': statistics.median(runs)}
+
+
+def report(bench, case, **values):
+    fields = ' '.join('{}={}'.format(k, fmt(v)) for k, v in values.items())
+    print('{:<10} {:<34} {}'.format(bench, case, fields), flush=True)
+
+
+def fmt(value):
+    return '{:.4g}'.format(value) if isinstance(value, float) else str(value)
+
+
+def usec(seconds):
+    return '{:.1f}us'.format(seconds * 1e6)
+
+
+def msec(seconds):
+    return '{:.1f}ms'.format(seconds * 1e3)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""JSON decoder micro-benchmarks over trade, L2 book and instrument payloads
+
+`loads` rows time the decoder alone. `adapter` rows time the bravado
+adapter against a local stub, with bravado-core unmarshalling (no
+JSON_DECODER) and with the DecodedHttpFuture fast path. Pass recorded
+responses with --payloads, eg: trade.json, orderBookL2.json and
+instrument.json.
+"""
+
+import click
+
+from bench.common import (
+    StubServer, configure, load_payloads, measure, report, table_routes,
+    usec,
+)
+from psyduck.client.adapter import BitmexAdapter
+from psyduck.client.client import bitmex
+from psyduck.client.decoder import get_decoder
+
+DECODERS = ('json', 'simplejson', 'ujson', 'rapidjson', 'orjson')
+
+CALLS = {
+    'trade': lambda adapter: adapter.get_trade(count=500),
+    'orderBookL2': lambda adapter: adapter.get_order_book_l2('XBTUSD'),
+    'instrument': lambda adapter: adapter.get_instrument_active(),
+}
+
+
+def available():
+    decoders = {}
+    for name in DECODERS:
+        try:
+            decoders[name] = get_decoder(name)
+        except ImportError:
+            pass
+    return decoders
+
+
+@click.command()
+@click.option('--number', '-n', default=100, help='Calls per run.')
+@click.option('--payloads', type=click.Path(file_okay=False),
+              help='Directory of recorded <table>.json responses.')
+def main(number, payloads):
+    payloads = load_payloads(payloads)
+    decoders = available()
+    for table, body in payloads.items():
+        for name, loads in decoders.items():
+            result = measure(lambda: loads(body), number)
+            report('decoder', 'loads {} {}'.format(table, name),
+                   kib=len(body) // 1024, best=usec(result['best']),
+                   median=usec(result['median']))
+
+    with StubServer(table_routes(payloads)) as server:
+        for name in (None,) + tuple(decoders):
+            config = configure(HOST=server.host, RATE_LIMIT_BACKEND=None,
+                               SWAGGER_CACHE_PATH=None, JSON_DECODER=name)
+            adapter = BitmexAdapter(bitmex(config))
+            for table, call in CALLS.items():
+                call(adapter)
+                result = measure(lambda: call(adapter), number // 10 or 1)
+                report('decoder', 'adapter {} {}'.format(
+                    table, name or 'bravado-core'),
+                    best=usec(result['best']),
+                    median=usec(result['median']))
+
+
+if __name__ == '__main__':
+    main()
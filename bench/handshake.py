@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Connection reuse: the pooled keep-alive session against a new connection
+per call
+
+The stub counts accepted connections, so every row shows how many TCP
+handshakes the calls cost. TLS handshakes against the real host cost
+several round trips more than the plain TCP measured here.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+import requests
+
+from bench.common import StubServer, configure, report, usec
+from psyduck.client.client import ProxyClient
+
+
+def timed(server, calls, fn, threads=1):
+    server.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: fn(), range(calls)))
+    elapsed = time.perf_counter() - start
+    return elapsed / calls, server.connections
+
+
+@click.command()
+@click.option('--calls', '-n', default=500, help='Requests per case.')
+@click.option('--threads', '-t', default=8, help='Threads in the concurrent '
+              'cases.')
+def main(calls, threads):
+    with StubServer({'/api/v1/instrument/active': b'[]'}) as server:
+        config = configure(HOST=server.host)
+        pooled = ProxyClient.from_config(config).session
+        url = server.host + '/api/v1/instrument/active'
+
+        def fresh():
+            with requests.Session() as session:
+                session.get(url).content
+
+        cases = [
+            ('new connection', fresh, 1),
+            ('pooled', lambda: pooled.get(url).content, 1),
+            ('new connection x{}'.format(threads), fresh, threads),
+            ('pooled x{}'.format(threads),
+             lambda: pooled.get(url).content, threads),
+        ]
+        for name, fn, workers in cases:
+            per_call, connections = timed(server, calls, fn, workers)
+            report('handshake', name, per_call=usec(per_call),
+                   connections=connections, calls=calls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Order-book delta replay
+
+Replays orderBookL2 messages through OrderBooks and times the best
+bid/ask and top-10 depth reads. A dict-of-levels book that sorts on every
+read is the baseline. --replay takes recorded realtime messages, one JSON
+message per line; otherwise a seeded synthetic stream is used.
+"""
+
+import json
+import random
+import time
+
+import click
+
+from bench.common import level_id, measure, order_book, report, usec
+from psyduck.agent.orderbook import OrderBooks
+
+
+class SortingBook(object):
+
+    def __init__(self):
+        self.levels = {}
+
+    def handle(self, table, action, rows):
+        if action == 'partial':
+            self.levels.clear()
+        for row in rows:
+            if action == 'delete':
+                self.levels.pop(row['id'], None)
+            elif action == 'update':
+                if row['id'] in self.levels:
+                    self.levels[row['id']].update(row)
+            else:
+                self.levels[row['id']] = dict(row)
+
+    def best(self):
+        bids = [r['price'] for r in self.levels.values() if r['side'] == 'Buy']
+        asks = [r['price'] for r in self.levels.values()
+                if r['side'] == 'Sell']
+        return max(bids), min(asks)
+
+    def depth(self, n=10):
+        rows = sorted(self.levels.values(), key=lambda r: r['price'])
+        bids = [r for r in rows if r['side'] == 'Buy'][:-n - 1:-1]
+        asks = [r for r in rows if r['side'] == 'Sell'][:n]
+        return bids, asks
+
+
+def synthetic(levels, messages, seed=0):
+    """Seeded deltas over the snapshot's prices, ~80% of levels occupied"""
+
+    rng = random.Random(seed)
+    rows = order_book(levels)
+    yield {'table': 'orderBookL2', 'action': 'partial', 'data': rows}
+    book = {row['id']: row for row in rows}
+    mid = 6500.0
+    for _ in range(messages):
+        side = rng.choice(('Buy', 'Sell'))
+        step = rng.randint(1, levels // 2)
+        price = mid - (step - 1) * 0.5 if side == 'Buy' else \
+            mid + step * 0.5
+        id = level_id(price)
+        size = rng.randint(1, 10000)
+        if id not in book:
+            action = 'insert'
+            row = book[id] = {'symbol': 'XBTUSD', 'id': id, 'side': side,
+                              'size': size, 'price': price}
+        elif rng.random() < 0.25:
+            action = 'delete'
+            del book[id]
+            row = {'symbol': 'XBTUSD', 'id': id, 'side': side}
+        else:
+            action = 'update'
+            row = {'symbol': 'XBTUSD', 'id': id, 'side': side, 'size': size}
+        yield {'table': 'orderBookL2', 'action': action, 'data': [row]}
+
+
+def recorded(path):
+    with open(path, mode='r', encoding='utf-8') as fp:
+        for line in fp:
+            message = json.loads(line)
+            if message.get('table') == 'orderBookL2':
+                yield message
+
+
+def replay(book, messages):
+    start = time.perf_counter()
+    for message in messages:
+        book.handle(message['table'], message['action'], message['data'])
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option('--levels', default=1000, help='Levels in the snapshot.')
+@click.option('--messages', '-n', default=100000,
+              help='Synthetic delta messages.')
+@click.option('--replay', 'path', type=click.Path(exists=True),
+              help='Recorded realtime messages, one JSON per line.')
+def main(levels, messages, path):
+    stream = list(recorded(path) if path else synthetic(levels, messages))
+    rows = sum(len(m['data']) for m in stream)
+    symbol = stream[0]['data'][0]['symbol']
+
+    books = OrderBooks()
+    sorting = SortingBook()
+    for name, target in (('ladder', books), ('sorting', sorting)):
+        elapsed = replay(target, stream)
+        report('orderbook', 'replay ' + name, messages=len(stream),
+               rows=rows, per_row=usec(elapsed / rows),
+               rows_per_s='{:.0f}'.format(rows / elapsed))
+
+    book = books.get(symbol)
+    queries = [
+        ('best ladder', lambda: (book.best_bid, book.best_ask)),
+        ('best sorting', sorting.best),
+        ('depth10 ladder', lambda: book.depth(10)),
+        ('depth10 sorting', lambda: sorting.depth(10)),
+    ]
+    for name, fn in queries:
+        result = measure(fn, 100)
+        report('orderbook', name, best=usec(result['best']),
+               median=usec(result['median']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Per-call overhead of the bravado adapter against the direct HTTP path
+
+Both clients call the same local stub, so the difference is client-side
+work: request building, signing and response unmarshalling.
+"""
+
+import json
+
+import click
+
+from bench.common import (
+    StubServer, configure, load_payloads, measure, report, table_routes,
+    trades, usec,
+)
+from psyduck.client.adapter import BitmexAdapter
+from psyduck.client.client import bitmex
+from psyduck.client.http import HTTPAdapter
+
+
+@click.command()
+@click.option('--number', '-n', default=200, help='Calls per run.')
+@click.option('--payloads', type=click.Path(file_okay=False),
+              help='Directory of recorded <table>.json responses.')
+def main(number, payloads):
+    for rows in (1, 500):
+        routes = table_routes(load_payloads(payloads))
+        routes['/api/v1/trade'] = json.dumps(trades(rows)).encode('utf-8')
+        with StubServer(routes) as server:
+            config = configure(HOST=server.host, RATE_LIMIT_BACKEND=None,
+                               SWAGGER_CACHE_PATH=None)
+            adapter = BitmexAdapter(bitmex(config))
+            direct = HTTPAdapter.from_config(config)
+            url = server.host + '/api/v1/trade'
+            cases = [
+                ('session.get', lambda: direct.session.get(
+                    url, params={'count': rows}).content),
+                ('direct', lambda: direct.request(
+                    'GET', '/trade', query={'count': rows})),
+                ('bravado', lambda: adapter.get_trade(count=rows)),
+            ]
+            for name, fn in cases:
+                fn()
+                result = measure(fn, number)
+                report('overhead', '{} rows={}'.format(name, rows),
+                       best=usec(result['best']),
+                       median=usec(result['median']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Startup time: import cost and first client build, with and without the
+on-disk swagger cache
+
+Every run is a fresh interpreter, the spec is served by a local stub. Pass
+a recorded BitMEX swagger.json with --spec to time the full-size spec.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import click
+
+from bench.common import StubServer, msec, report
+
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import cfg
+cfg.CONFIG.config.update(json.loads(sys.argv[1]))
+import psyduck.client
+imported = time.perf_counter()
+if sys.argv[2] == 'build':
+    psyduck.client.raw_client.get()
+print(json.dumps([imported - start, time.perf_counter() - imported]))
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(overrides, mode):
+    output = subprocess.check_output(
+        [sys.executable, '-c', SCRIPT, json.dumps(overrides), mode],
+        cwd=ROOT, env=dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [ROOT, os.environ.get('PYTHONPATH')])
+        )),
+    )
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def median_of(runs, overrides, mode, before=None):
+    results = []
+    for _ in range(runs):
+        if before:
+            before()
+        results.append(run(overrides, mode))
+    return (
+        statistics.median(r[0] for r in results),
+        statistics.median(r[1] for r in results),
+    )
+
+
+def remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@click.command()
+@click.option('--runs', '-n', default=5, help='Interpreters per case.')
+@click.option('--spec', type=click.Path(exists=True, dir_okay=False),
+              help='Recorded swagger.json to serve instead of the subset.')
+def main(runs, spec):
+    if spec:
+        with open(spec, mode='rb') as fp:
+            spec = fp.read()
+    with StubServer(spec=spec) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, 'swagger.json')
+        base = {'HOST': server.host, 'RATE_LIMIT_BACKEND': None}
+        cached = dict(base, SWAGGER_CACHE_PATH=cache)
+        cases = [
+            ('import only', base, 'import', None),
+            ('from_url', base, 'build', None),
+            ('cache cold', cached, 'build', lambda: remove(cache)),
+            ('cache revalidated (304)', cached, 'build', None),
+            ('cache without revalidation',
+             dict(cached, SWAGGER_REVALIDATE=False), 'build', None),
+        ]
+        for name, overrides, mode, before in cases:
+            server.reset()
+            imported, built = median_of(runs, overrides, mode, before)
+            report(
+                'startup', name, imports=msec(imported),
+                first_client=msec(built), spec_requests=server.requests,
+            )
+
+
+if __name__ == '__main__':
+    main()
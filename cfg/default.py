@@ -4,9 +4,47 @@ CONFIG = {
     'TEST_NET': True,
     'HOST': 'https://testnet.bitmex.com',
     'SWAGGER_PATH': '/api/explorer/swagger.json',
+    'SWAGGER_CACHE_PATH': None,
+    'SWAGGER_REVALIDATE': True,
     'API_KEY': '',
     'API_SECRET': '',
     'PROXIES': None,
+    'FUTURE_WORKERS': 20,
+    'POOL_CONNECTIONS': 10,
+    'POOL_MAXSIZE': 20,
+    'POOL_BLOCK': True,
+    'MAX_RETRIES': 0,
+    'CONNECT_TIMEOUT': 3.05,
+    'READ_TIMEOUT': 10,
+    'TCP_KEEPALIVE': True,
+    'TCP_KEEPALIVE_IDLE': 60,
+    'JSON_DECODER': None,
+    'RATE_LIMIT_BACKEND': 'local',
+    'RATE_LIMITS': {
+        'read': (1, 60),
+        'order': (1, 60),
+    },
+    'BATCH_WINDOW': 0.005,
+    'BATCH_SIZE': 10,
+    'WS_URL': None,
+    'WS_SYMBOLS': None,
     'REDIS_URI': 'redis://localhost:6379',
+    'REDIS_MAX_CONNECTIONS': 50,
+    'REDIS_POOL_TIMEOUT': 1,
+    'REDIS_SOCKET_TIMEOUT': 1,
+    'REDIS_CONNECT_TIMEOUT': 1,
+    'REDIS_KEEPALIVE': True,
+    'REDIS_RETRY_ON_TIMEOUT': True,
+    'REDIS_HIREDIS': True,
     'REAL_TIME_EXPIRE': 30,
+    'INSTRUMENT_CODEC': 'binary',
+    'LOCAL_CACHE_SIZE': 1024,
+    'LOCAL_CACHE_TTL': 1,
+    'NEGATIVE_CACHE_TTL': 30,
+    'REFRESH_LOCK_TIMEOUT': 10,
+    'REFRESH_POLL_INTERVAL': 0.05,
+    'REFRESH_INTERVAL': 20,
+    'AGENT_ENDPOINTS': {
+        'get_instrument_indices': 60,
+    },
 }
@@ -2,17 +2,34 @@
 
 import json
 import re
+from collections import OrderedDict
 
 import click
 
 REGEX = re.compile('((?:[A-Z]?[a-z\d]+)|(?:[A-Z\d]+))')
 
+MODES = ('bravado', 'direct', 'async')
+
+DTYPES = {
+    'integer': 'int64',
+    'number': 'float64',
+    'boolean': 'bool',
+}
+
+# swagger parameter location -> keyword of HTTPAdapter.request
+LOCATIONS = (
+    ('path', 'path_params'),
+    ('query', 'query'),
+    ('formData', 'form'),
+)
+
 
 class Generator(object):
 
-    def __init__(self, output, swagger):
+    def __init__(self, output, swagger, mode='bravado'):
         self.file = open(output, 'w', encoding='utf-8')
         self.indent_level = 0
+        self.mode = mode
         with open(swagger, mode='r', encoding='utf-8') as fp:
             self.swagger = json.load(fp)
 
@@ -43,14 +60,75 @@ class Generator(object):
         self.file.close()
 
     def class_begin(self):
+        if self.mode == 'direct':
+            self.direct_class_begin('DirectBitmexAdapter', 'HTTPAdapter')
+            return
+        if self.mode == 'async':
+            self.direct_class_begin('AsyncBitmexAdapter', 'AsyncHTTPAdapter')
+            return
         self.write('class BitmexAdapter(metaclass=RequestMeta):\n')
         self.newline()
         self.indent()
-        self.write_method('__init__', ['client'], [])
+        self.write_paginated()
+        self.write_column_types()
+        self.write_method('__init__', ['client'], ['limiter'])
         self.indent()
-        self.write('self.client = client')
+        self.writeln('self.client = client')
+        self.write('self.limiter = limiter')
         self.revert_indent()
 
+    def direct_class_begin(self, name, base):
+        self.write('class {}({}, metaclass=RequestMeta):\n'.format(name, base))
+        self.newline()
+        self.indent()
+        self.write("BASE_PATH = '{}'".format(self.swagger.get('basePath', '')))
+        self.newline()
+        self.write_paginated()
+        self.write_column_types()
+
+    def write_paginated(self):
+        methods = []
+        for detail in self.swagger['paths'].values():
+            for api in detail.values():
+                names = {p['name'] for p in api['parameters']}
+                if {'count', 'start'} <= names:
+                    methods.append(self.get_method_name(api['operationId']))
+        self.write('PAGINATED = (')
+        self.write(''.join(["'{}', ".format(m) for m in methods]))
+        self.write(')')
+        self.newline()
+        self.newline()
+
+    def write_column_types(self):
+        self.write('COLUMN_TYPES = {')
+        for detail in self.swagger['paths'].values():
+            for api in detail.values():
+                types = self.get_column_types(api)
+                if not types:
+                    continue
+                self.write("'{}': {{".format(
+                    self.get_method_name(api['operationId'])
+                ))
+                self.write(''.join(
+                    ["'{}': '{}', ".format(k, v) for k, v in types.items()]
+                ))
+                self.write('}, ')
+        self.write('}')
+        self.newline()
+        self.newline()
+
+    def get_column_types(self, api):
+        response = api.get('responses', {}).get('200', {})
+        schema = response.get('schema', {})
+        ref = schema.get('items', {}).get('$ref', '')
+        if schema.get('type') != 'array' or not ref:
+            return None
+        definition = self.swagger['definitions'][ref.split('/')[-1]]
+        return OrderedDict(
+            (name, self.get_dtype(prop))
+            for name, prop in definition.get('properties', {}).items()
+        )
+
     def write_doc(self, s):
         self.writeln('"""')
         self.writeln(s)
@@ -59,13 +137,17 @@ class Generator(object):
     def gen(self):
         self.file_doc()
         self.newline()
+        if self.mode == 'direct':
+            self.writeln('from psyduck.client.http import HTTPAdapter')
+        elif self.mode == 'async':
+            self.writeln('from psyduck.client.aio import AsyncHTTPAdapter')
         self.writeln('from psyduck.client.meta import RequestMeta')
         self.newline()
         self.newline()
         self.class_begin()
         for path, detail in self.swagger['paths'].items():
             for method, api in detail.items():
-                self.write_api(api)
+                self.write_api(path, method, api)
         self.revert_indent()
         self.flush()
         self.close()
@@ -75,18 +157,23 @@ class Generator(object):
         s = '{}\n\n{}'.format(info['title'], info['description'])
         self.write_doc(s)
 
-    def write_api(self, api):
-        method = self.get_method_name(api['operationId'])
+    def write_api(self, path, method, api):
+        name = self.get_method_name(api['operationId'])
         params = api['parameters']
         args = [p['name'] for p in params if p['required']]
         kwargs = [p['name'] for p in params if not p['required']]
-        self.write_method(method, args, kwargs)
+        self.write_method(name, args, kwargs)
         self.indent()
         self.write_api_doc(api)
-        self.write_call(api)
+        if self.mode in ('direct', 'async'):
+            self.write_direct_call(path, method, api)
+        else:
+            self.write_call(api)
         self.revert_indent()
 
     def write_method(self, method, args, kwargs):
+        if self.mode == 'async' and method != '__init__':
+            self.write('async ')
         self.write('def {method}(self'.format(method=method))
         if args:
             self.write(', ')
@@ -122,6 +209,26 @@ class Generator(object):
         ))
         self.write(').result()')
 
+    def write_direct_call(self, path, method, api):
+        params = api['parameters']
+        self.write('return await ' if self.mode == 'async' else 'return ')
+        self.write("self.request('{}', '{}'".format(method.upper(), path))
+        for location, keyword in LOCATIONS:
+            names = [p['name'] for p in params if p['in'] == location]
+            if not names:
+                continue
+            self.write(', {}={{'.format(keyword))
+            self.write(', '.join(["'{}': {}".format(
+                name, self.snake_format(name)) for name in names]
+            ))
+            self.write('}')
+        for param in params:
+            if param['in'] == 'body':
+                self.write(', body={}'.format(
+                    self.snake_format(param['name'])
+                ))
+        self.write(')')
+
     def format_param_desc(self, desc):
         text = '\n' + '    ' * self.indent_level
         return desc.replace('\n\n', text)
@@ -140,6 +247,17 @@ class Generator(object):
             return cls.snake_format(''.join(words))
         return cls.snake_format(''.join([words[0], tag] + words[1:]))
 
+    @classmethod
+    def get_dtype(cls, prop):
+        """Map a swagger property to the numpy dtype of its column"""
+
+        kind, fmt = prop.get('type'), prop.get('format')
+        if kind == 'string' and fmt == 'date-time':
+            return 'datetime64[ms]'
+        if kind == 'number' and fmt in ('int32', 'int64'):
+            return 'int64'
+        return DTYPES.get(kind, 'object')
+
     @classmethod
     def snake_format(cls, string):
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', string)
@@ -149,8 +267,9 @@ class Generator(object):
 @click.command()
 @click.option('--output', '-o')
 @click.option('--swagger', '-s')
-def generate(output, swagger):
-    Generator(output, swagger).gen()
+@click.option('--mode', '-m', type=click.Choice(MODES), default='bravado')
+def generate(output, swagger, mode):
+    Generator(output, swagger, mode).gen()
 
 
 if __name__ == '__main__':
@@ -2,6 +2,8 @@
 
 DIR=$(pwd)
 CLIENT=${DIR}/psyduck/client/adapter.py
+DIRECT=${DIR}/psyduck/client/direct.py
+ASYNC=${DIR}/psyduck/client/async_adapter.py
 RESOURCES="https://www.bitmex.com/api/explorer/swagger.json"
 
 echo "Getting swagger.json..."
@@ -10,6 +12,8 @@ wget ${RESOURCES}
 
 echo "Generating client code..."
 python ${DIR}/codegen.py -o ${CLIENT} -s ${DIR}/swagger.json
-yapf -i ${CLIENT}
+python ${DIR}/codegen.py -o ${DIRECT} -s ${DIR}/swagger.json -m direct
+python ${DIR}/codegen.py -o ${ASYNC} -s ${DIR}/swagger.json -m async
+yapf -i ${CLIENT} ${DIRECT} ${ASYNC}
 
 rm ${DIR}/swagger.json
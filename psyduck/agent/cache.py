@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """Bounded in-process LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, maxsize=1024, ttl=1):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None or item[1] <= time.monotonic():
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def get_with_age(self, key):
+        """Get (value, age in seconds) of an entry, even if it has expired"""
+
+        with self.lock:
+            item = self.data.get(key)
+        if item is None:
+            return None, None
+        return item[0], time.monotonic() - item[2]
+
+    def get_stale(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+        return default if item is None else item[0]
+
+    def set(self, key, value, ttl=None, age=0):
+        now = time.monotonic()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.data[key] = (value, expires, now - age)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.data),
+        }
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+from functools import partial
+
+import click
+
+from cfg import CONFIG
+from psyduck.agent.distributor import Distributor
+from psyduck.agent.scheduler import Scheduler
+
+logger = logging.getLogger('psyduck.agent')
+
+
+def build_scheduler(interval=None, metrics_interval=60):
+    scheduler = Scheduler()
+    Distributor.add_refresher(scheduler, interval)
+    for name, job_interval in (CONFIG.AGENT_ENDPOINTS or {}).items():
+        scheduler.add(
+            name, partial(Distributor.refresh_endpoint, name, job_interval),
+            job_interval,
+        )
+    if metrics_interval:
+        scheduler.add(
+            'metrics', partial(log_metrics, scheduler), metrics_interval
+        )
+    return scheduler
+
+
+def log_metrics(scheduler):
+    metrics = {
+        'scheduler': scheduler.metrics,
+        'local_cache': Distributor.local_cache.stats,
+        'writes': Distributor.write_stats,
+    }
+    logger.info('metrics %s', json.dumps(metrics))
+    return metrics
+
+
+@click.command(name='psyduck-agent')
+@click.option('--interval', '-i', type=float,
+              help='Instrument refresh interval in seconds.')
+@click.option('--metrics-interval', type=float, default=60,
+              help='Seconds between metrics log lines, 0 to disable.')
+@click.option('--feed/--no-feed', default=False,
+              help='Also apply the realtime WebSocket feed.')
+def main(interval, metrics_interval, feed):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s %(name)s %(levelname)s %(message)s',
+    )
+    Distributor.publisher = True
+    scheduler = build_scheduler(interval, metrics_interval)
+    if feed:
+        Distributor.start_feed()
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+if __name__ == '__main__':
+    main(prog_name='psyduck-agent')
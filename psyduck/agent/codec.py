@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import struct
+
+PRICES = struct.Struct('<3d')
+
+
+def encode_binary(instrument):
+    """Pack an instrument as price, bid, ask doubles followed by the symbol"""
+
+    symbol, prices = instrument[0], instrument[1:]
+    packed = PRICES.pack(*[math.nan if p is None else p for p in prices])
+    return packed + symbol.encode('utf-8')
+
+
+def decode_binary(value):
+    prices = [None if math.isnan(p) else p for p in PRICES.unpack_from(value)]
+    return [value[PRICES.size:].decode('utf-8')] + prices
+
+
+def encode_json(instrument):
+    return json.dumps(instrument)
+
+
+def decode_json(value):
+    return json.loads(value)
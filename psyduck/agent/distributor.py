@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import json
+import threading
+import time
 from collections import namedtuple
 
+from redis.exceptions import LockError
+
 from cfg import CONFIG
+from psyduck.agent import codec
+from psyduck.agent.cache import TTLCache
+from psyduck.agent.feed import MarketFeed
+from psyduck.agent.scheduler import Scheduler
+from psyduck.agent.singleflight import SingleFlight
 from psyduck.client import client
 from psyduck.redis import cache_client
 
@@ -14,35 +23,384 @@ Instrument = namedtuple('Instrument', ['symbol', 'price', 'bid', 'ask'])
 class Distributor(object):
 
     INSTRUMENT_CACHE_KEY = 'instrument:{}'
+    BINARY_CACHE_KEY = 'instrument:v2:{}'
+    INSTRUMENT_CHANNEL = 'instrument:updates'
+    ENDPOINT_CACHE_KEY = 'endpoint:{}'
+    REFRESH_LOCK_KEY = 'lock:instrument:refresh'
+
+    local_cache = TTLCache(
+        CONFIG.LOCAL_CACHE_SIZE,
+        min(CONFIG.LOCAL_CACHE_TTL, CONFIG.REAL_TIME_EXPIRE),
+    )
+    missing = TTLCache(CONFIG.LOCAL_CACHE_SIZE, CONFIG.NEGATIVE_CACHE_TTL)
+    flight = SingleFlight()
+    refresher = None
+    scheduler = None
+    feed = None
+    publisher = False
+    symbols = {}
+    indexed_at = None
+    snapshot = {}
+    write_stats = {'sets': 0, 'expires': 0, 'rewrites': 0}
+    write_lock = threading.RLock()
+    updated_at = {}
 
     @classmethod
     def get_instrument(cls, symbol):
-        key = cls.INSTRUMENT_CACHE_KEY.format(symbol)
-        value = cache_client.get(key)
-        if value:
-            return Instrument(*json.loads(value))
+        instrument = cls.local_cache.get(symbol)
+        if instrument:
+            return instrument
+        if cls.missing.get(symbol):
+            return None
+        instrument = cls.load_instrument(symbol)
+        if instrument:
+            return instrument
         return cls.get_active_instrument(symbol)
 
+    @classmethod
+    def get_instrument_with_age(cls, symbol):
+        """Get (instrument, seconds since it was last pulled)"""
+
+        if cls.missing.get(symbol):
+            return None, None
+        if cls.local_cache.get(symbol) is None and \
+                cls.load_instrument(symbol) is None:
+            cls.get_active_instrument(symbol)
+        return cls.local_cache.get_with_age(symbol)
+
+    @classmethod
+    def get_instruments(cls, symbols):
+        """Get {symbol: instrument} of many symbols in one Redis round-trip"""
+
+        result = {}
+        pending = []
+        for symbol in symbols:
+            instrument = cls.local_cache.get(symbol)
+            if instrument:
+                result[symbol] = instrument
+            elif cls.missing.get(symbol):
+                result[symbol] = None
+            else:
+                pending.append(symbol)
+        if pending:
+            result.update(cls.load_instruments(pending))
+        for symbol in symbols:
+            if symbol not in result:
+                result[symbol] = cls.get_active_instrument(symbol)
+        return result
+
+    @classmethod
+    def load_instrument(cls, symbol):
+        return cls.load_instruments([symbol]).get(symbol)
+
+    @classmethod
+    def load_instruments(cls, symbols):
+        keys = []
+        for symbol in symbols:
+            keys.append(cls.BINARY_CACHE_KEY.format(symbol))
+            keys.append(cls.INSTRUMENT_CACHE_KEY.format(symbol))
+        pipe = cache_client.pipeline(transaction=False)
+        pipe.mget(keys)
+        for key in keys:
+            pipe.pttl(key)
+        values, *ttls = pipe.execute()
+        result = {}
+        for i, symbol in enumerate(symbols):
+            binary, legacy = values[2 * i], values[2 * i + 1]
+            instrument = cls.decode_instrument(binary, legacy)
+            if instrument:
+                ttl = ttls[2 * i] if binary else ttls[2 * i + 1]
+                cls.local_cache.set(
+                    symbol, instrument, age=cls.instrument_age(ttl)
+                )
+                result[symbol] = instrument
+        return result
+
+    @classmethod
+    def instrument_age(cls, ttl):
+        # every pull resets the key's TTL, so the time it has run down is
+        # the time since the value was last confirmed
+        if ttl is None or ttl < 0:
+            return 0
+        return max(0, CONFIG.REAL_TIME_EXPIRE - ttl / 1000)
+
+    @classmethod
+    def decode_instrument(cls, binary, legacy):
+        if binary:
+            return Instrument(*codec.decode_binary(binary))
+        if legacy:
+            return Instrument(*codec.decode_json(legacy))
+        return None
+
+    @classmethod
+    def encode_instrument(cls, instrument):
+        if CONFIG.INSTRUMENT_CODEC == 'binary':
+            key = cls.BINARY_CACHE_KEY.format(instrument.symbol)
+            return key, codec.encode_binary(instrument)
+        key = cls.INSTRUMENT_CACHE_KEY.format(instrument.symbol)
+        return key, codec.encode_json(instrument)
+
     @classmethod
     def get_active_instrument(cls, symbol):
-        instruments = cls.pull_active_instruments()
-        mapping = {i.symbol: i for i in instruments}
-        return mapping.get(symbol)
+        if cls.missing.get(symbol):
+            return None
+        if cls.index_fresh():
+            return cls.lookup_symbol(symbol)
+        if cls.flight.in_flight(cls.REFRESH_LOCK_KEY):
+            stale = cls.local_cache.get_stale(symbol)
+            if stale:
+                return stale
+        instruments = cls.refresh_instruments()
+        if instruments is None:
+            instrument = cls.wait_instrument(symbol)
+        else:
+            instrument = cls.lookup_symbol(symbol)
+        return instrument or cls.local_cache.get_stale(symbol)
+
+    @classmethod
+    def index_fresh(cls):
+        return cls.indexed_at is not None and \
+            time.monotonic() - cls.indexed_at < CONFIG.REAL_TIME_EXPIRE
+
+    @classmethod
+    def lookup_symbol(cls, symbol):
+        instrument = cls.symbols.get(symbol)
+        if instrument is None:
+            cls.missing.set(symbol, True)
+        return instrument
+
+    @classmethod
+    def refresh_instruments(cls):
+        return cls.flight.do(
+            cls.REFRESH_LOCK_KEY, cls.pull_active_instruments_locked
+        )
+
+    @classmethod
+    def add_refresher(cls, scheduler, interval=None):
+        """Schedule instrument refreshes ahead of expiry on `scheduler`"""
+
+        cls.refresher = scheduler.add(
+            'instruments', cls.refresh_instruments,
+            interval or CONFIG.REFRESH_INTERVAL,
+        )
+        return cls.refresher
+
+    @classmethod
+    def start_refresher(cls, interval=None):
+        """Refresh the instrument cache in the background ahead of expiry"""
+
+        if cls.scheduler is None:
+            cls.scheduler = Scheduler()
+            cls.add_refresher(cls.scheduler, interval)
+        cls.scheduler.start()
+        return cls.refresher
+
+    @classmethod
+    def start_feed(cls):
+        """Keep the instrument cache updated from the realtime feed"""
+
+        if cls.feed is None:
+            cls.feed = MarketFeed.from_config(CONFIG, on_change=cls.apply_feed)
+        cls.feed.start()
+        return cls.feed
+
+    @classmethod
+    def apply_feed(cls, table, action, rows):
+        if action == 'delete':
+            if table == 'instrument':
+                cls.remove_instruments({row['symbol'] for row in rows})
+            return
+        instruments = []
+        for symbol in {row['symbol'] for row in rows}:
+            raw_item = cls.feed.get('instrument', symbol)
+            if raw_item is None:
+                continue
+            quote = cls.feed.get('quote', symbol)
+            if quote:
+                raw_item = dict(
+                    raw_item, bidPrice=quote['bidPrice'],
+                    askPrice=quote['askPrice'],
+                )
+            instruments.append(cls.format_instrument(raw_item))
+        if instruments:
+            cls.set_instruments_cache(instruments, replace=False)
+
+    @classmethod
+    def remove_instruments(cls, symbols):
+        """Drop delisted instruments from Redis and the local indexes"""
+
+        if not symbols:
+            return
+        with cls.write_lock:
+            pipe = cache_client.pipeline()
+            pipe.delete(*[
+                key.format(symbol) for symbol in symbols
+                for key in (cls.BINARY_CACHE_KEY, cls.INSTRUMENT_CACHE_KEY)
+            ])
+            removed = [symbol for symbol in symbols if symbol in cls.snapshot]
+            if cls.publisher and removed:
+                pipe.publish(cls.INSTRUMENT_CHANNEL, codec.encode_json({
+                    'changed': [],
+                    'removed': removed,
+                }))
+            pipe.execute()
+            cls.snapshot = {
+                k: v for k, v in cls.snapshot.items() if k not in symbols
+            }
+            cls.symbols = {
+                k: v for k, v in cls.symbols.items() if k not in symbols
+            }
+            now = time.monotonic()
+            for symbol in symbols:
+                cls.local_cache.delete(symbol)
+                cls.updated_at[symbol] = now
+
+    @classmethod
+    def pull_active_instruments_locked(cls):
+        """Pull instruments unless another process is already doing so"""
+
+        lock = cache_client.lock(
+            cls.REFRESH_LOCK_KEY, timeout=CONFIG.REFRESH_LOCK_TIMEOUT
+        )
+        if not lock.acquire(blocking=False):
+            return None
+        try:
+            return cls.pull_active_instruments()
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                pass
+
+    @classmethod
+    def wait_instrument(cls, symbol):
+        deadline = time.monotonic() + CONFIG.REFRESH_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            instrument = cls.load_instrument(symbol)
+            if instrument or not cache_client.exists(cls.REFRESH_LOCK_KEY):
+                return instrument
+            time.sleep(CONFIG.REFRESH_POLL_INTERVAL)
+        return None
 
     @classmethod
     def pull_active_instruments(cls):
+        started = time.monotonic()
         raw_items = client.get_instrument_active()
         instruments = list(map(cls.format_instrument, raw_items))
-        cls.set_instruments_cache(instruments)
-        return instruments
+        return cls.set_instruments_cache(instruments, since=started)
+
+    @classmethod
+    def set_instruments_cache(cls, instruments, replace=True, since=None):
+        """Write instruments, keeping values written after `since`
+
+        Writes are serialized, as the feed thread and the refresh thread both
+        write. A pull passes its start time, so symbols the feed updated or
+        deleted while the REST call was in flight keep the feed's state.
+        """
+
+        with cls.write_lock:
+            if since is not None:
+                newer = {
+                    symbol for symbol, at in cls.updated_at.items()
+                    if at > since
+                }
+                pulled = {item.symbol for item in instruments}
+                instruments = [
+                    item for item in instruments if item.symbol not in newer
+                ] + [
+                    item for symbol, item in cls.symbols.items()
+                    if symbol in newer and (replace or symbol in pulled)
+                ]
+            cls.write_instruments(instruments, replace)
+            now = time.monotonic()
+            for item in instruments:
+                cls.updated_at[item.symbol] = now
+            return instruments
 
     @classmethod
-    def set_instruments_cache(cls, instruments):
+    def write_instruments(cls, instruments, replace=True):
+        encoded = [cls.encode_instrument(item) for item in instruments]
+        # compare with what Redis holds, other processes write these keys too
+        stored = cache_client.mget([key for key, _ in encoded]) \
+            if encoded else []
+        changed, removed, snapshot = [], [], None
+        if cls.publisher:
+            changed, removed, snapshot = cls.diff_instruments(
+                instruments, replace
+            )
+        written = []
         pipe = cache_client.pipeline()
+        for (key, value), current in zip(encoded, stored):
+            if current == as_bytes(value):
+                pipe.expire(key, CONFIG.REAL_TIME_EXPIRE)
+                written.append(False)
+            else:
+                pipe.set(key, value, CONFIG.REAL_TIME_EXPIRE)
+                written.append(True)
+        if changed or removed:
+            pipe.publish(cls.INSTRUMENT_CHANNEL, codec.encode_json({
+                'changed': changed,
+                'removed': removed,
+            }))
+        results = pipe.execute()
+        if snapshot is not None:
+            cls.snapshot = snapshot
+        cls.write_stats['sets'] += sum(written)
+        cls.write_stats['expires'] += len(written) - sum(written)
+
+        # EXPIRE is a no-op on keys that expired or were evicted meanwhile
+        expired = [
+            item for item, is_set, result in zip(encoded, written, results)
+            if not is_set and not result
+        ]
+        if expired:
+            pipe = cache_client.pipeline()
+            for key, value in expired:
+                pipe.set(key, value, CONFIG.REAL_TIME_EXPIRE)
+            pipe.execute()
+            cls.write_stats['rewrites'] += len(expired)
+        for item in instruments:
+            cls.local_cache.set(item.symbol, item)
+            cls.missing.delete(item.symbol)
+        symbols = {item.symbol: item for item in instruments}
+        if replace:
+            cls.symbols = symbols
+            cls.indexed_at = time.monotonic()
+        else:
+            cls.symbols = dict(cls.symbols, **symbols)
+
+    @classmethod
+    def diff_instruments(cls, instruments, replace=True):
+        """Get (changed, removed, snapshot) against the last published one
+
+        The caller stores the new snapshot once its writes have succeeded.
+        """
+
+        snapshot = dict(cls.snapshot) if not replace else {}
+        changed = []
         for item in instruments:
-            key = cls.INSTRUMENT_CACHE_KEY.format(item.symbol)
-            pipe.set(key, json.dumps(item), CONFIG.REAL_TIME_EXPIRE)
-        pipe.execute()
+            if cls.snapshot.get(item.symbol) != item:
+                changed.append(item)
+            snapshot[item.symbol] = item
+        removed = [s for s in cls.snapshot if s not in snapshot]
+        return changed, removed, snapshot
+
+    @classmethod
+    def refresh_endpoint(cls, name, interval):
+        """Cache the result of a parameterless adapter method"""
+
+        data = getattr(client, name)()
+        key = cls.ENDPOINT_CACHE_KEY.format(name)
+        cache_client.set(
+            key, json.dumps(data, default=str),
+            int(interval * 2) + CONFIG.REAL_TIME_EXPIRE,
+        )
+        return data
+
+    @classmethod
+    def get_endpoint(cls, name):
+        value = cache_client.get(cls.ENDPOINT_CACHE_KEY.format(name))
+        return json.loads(value) if value else None
 
     @classmethod
     def format_instrument(cls, raw_item):
@@ -52,3 +410,7 @@ class Distributor(object):
             bid=raw_item['bidPrice'],
             ask=raw_item['askPrice'],
         )
+
+
+def as_bytes(value):
+    return value if isinstance(value, bytes) else value.encode('utf-8')
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import threading
+
+import websocket
+
+logger = logging.getLogger(__name__)
+
+
+class MarketFeed(object):
+    """BitMEX realtime subscriber keeping local copies of its tables
+
+    `partial`, `insert`, `update` and `delete` messages are applied
+    incrementally and every changed row is passed to `on_change` as
+    (table, action, rows). With `keep=False` no local tables are kept and
+    messages are passed through as they are, eg: to an OrderBooks.
+    """
+
+    TABLES = ('instrument', 'quote')
+    RECONNECT_DELAY = 1
+
+    def __init__(self, url, tables=TABLES, symbols=None, on_change=None,
+                 keep=True):
+        self.url = url
+        self.tables = tables
+        self.symbols = symbols
+        self.on_change = on_change
+        self.keep = keep
+        self.data = {}
+        self.keys = {}
+        self.ws = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        url = config.WS_URL or \
+            config.HOST.replace('http', 'ws', 1) + '/realtime'
+        return cls(url, symbols=config.WS_SYMBOLS, **kwargs)
+
+    def subscriptions(self):
+        if not self.symbols:
+            return list(self.tables)
+        return ['{}:{}'.format(table, symbol)
+                for table in self.tables for symbol in self.symbols]
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.ws:
+            self.ws.close()
+
+    def run_forever(self):
+        url = '{}?subscribe={}'.format(
+            self.url, ','.join(self.subscriptions())
+        )
+        while not self.stopped.is_set():
+            self.ws = websocket.WebSocketApp(
+                url,
+                on_message=lambda ws, message: self.handle(message),
+                on_error=lambda ws, error: logger.warning(
+                    'websocket error: %s', error
+                ),
+            )
+            self.ws.run_forever(ping_interval=15, ping_timeout=10)
+            self.stopped.wait(self.RECONNECT_DELAY)
+
+    def handle(self, message):
+        message = json.loads(message)
+        table, action = message.get('table'), message.get('action')
+        if not table or not action:
+            return
+        rows = message.get('data', [])
+        if not self.keep:
+            if rows and self.on_change:
+                self.on_change(table, action, rows)
+            return
+        if action == 'partial':
+            self.keys[table] = message.get('keys') or ['symbol']
+            self.clear(table, message.get('filter'))
+        if table not in self.data:
+            return
+        store = self.data[table]
+        changed = []
+        for row in rows:
+            key = self.row_key(table, row)
+            if action == 'delete':
+                store.pop(key, None)
+                changed.append(row)
+            elif action == 'update':
+                if key in store:
+                    store[key].update(row)
+                    changed.append(store[key])
+            else:
+                store[key] = row
+                changed.append(row)
+        if changed and self.on_change:
+            self.on_change(table, action, changed)
+
+    def clear(self, table, filter=None):
+        """Drop the rows replaced by a partial, only those matching its filter"""
+
+        store = self.data.get(table)
+        if store is None or not filter:
+            self.data[table] = {}
+            return
+        for key, row in list(store.items()):
+            if all(row.get(k) == v for k, v in filter.items()):
+                del store[key]
+
+    def row_key(self, table, row):
+        return tuple(row.get(k) for k in self.keys.get(table, ['symbol']))
+
+    def get(self, table, *key):
+        return self.data.get(table, {}).get(key)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from cfg import CONFIG
+from psyduck.agent import codec
+from psyduck.agent.distributor import Distributor, Instrument
+from psyduck.redis import cache_client
+
+
+class InstrumentMirror(object):
+    """Local copy of the instrument cache kept current by pushed diffs
+
+    Subscribes to Distributor.INSTRUMENT_CHANNEL, where the agent process
+    publishes only the instruments that changed between pulls. A diff can be
+    lost, so entries older than `max_age` seconds are read again through
+    Distributor.get_instrument.
+    """
+
+    def __init__(self, symbols=None, max_age=None):
+        self.symbols = symbols
+        self.max_age = max_age or CONFIG.REAL_TIME_EXPIRE
+        self.instruments = {}
+        self.pubsub = None
+        self.thread = None
+
+    def start(self, sleep_time=0.1):
+        self.pubsub = cache_client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(**{Distributor.INSTRUMENT_CHANNEL: self.handle})
+        self.thread = self.pubsub.run_in_thread(sleep_time, daemon=True)
+        if self.symbols:
+            seed = Distributor.get_instruments(self.symbols)
+            now = time.monotonic()
+            for symbol, instrument in seed.items():
+                if instrument:
+                    self.instruments.setdefault(symbol, (instrument, now))
+        return self.thread
+
+    def stop(self):
+        if self.thread:
+            self.thread.stop()
+        if self.pubsub:
+            self.pubsub.close()
+
+    def handle(self, message):
+        diff = codec.decode_json(message['data'])
+        now = time.monotonic()
+        for values in diff['changed']:
+            instrument = Instrument(*values)
+            self.instruments[instrument.symbol] = (instrument, now)
+        for symbol in diff['removed']:
+            self.instruments.pop(symbol, None)
+
+    def get(self, symbol):
+        return self.get_with_age(symbol)[0]
+
+    def get_with_age(self, symbol):
+        """Get (instrument, age in seconds) of a mirrored symbol"""
+
+        entry = self.instruments.get(symbol)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] < self.max_age:
+            return entry[0], now - entry[1]
+        instrument, age = Distributor.get_instrument_with_age(symbol)
+        if instrument is None:
+            self.instruments.pop(symbol, None)
+            return None, None
+        self.instruments[symbol] = (instrument, now - age)
+        return instrument, age
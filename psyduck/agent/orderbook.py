@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+BUY = 'Buy'
+SELL = 'Sell'
+
+
+class OrderBook(object):
+    """Local L2 book of one symbol, keyed by BitMEX level id
+
+    Each side keeps its prices in a sorted ladder, so the best bid and ask
+    are read in O(1), top-N depth is a slice and a level is found by
+    bisection.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.levels = {}
+        self.sizes = {BUY: {}, SELL: {}}
+        self.ladders = {BUY: [], SELL: []}
+
+    @classmethod
+    def from_snapshot(cls, symbol, rows):
+        book = cls(symbol)
+        book.apply('partial', rows)
+        return book
+
+    def apply(self, action, rows):
+        if action == 'partial':
+            self.clear()
+            action = 'insert'
+        handler = getattr(self, action)
+        for row in rows:
+            handler(row)
+
+    def clear(self):
+        self.levels.clear()
+        for side in (BUY, SELL):
+            self.sizes[side].clear()
+            del self.ladders[side][:]
+
+    def insert(self, row):
+        side, price = row['side'], row['price']
+        self.levels[row['id']] = (side, price)
+        sizes = self.sizes[side]
+        if price not in sizes:
+            insort(self.ladders[side], price)
+        sizes[price] = row['size']
+
+    def update(self, row):
+        level = self.levels.get(row['id'])
+        if level is None:
+            if 'price' in row:
+                self.insert(row)
+            return
+        side, price = level
+        self.sizes[side][price] = row['size']
+
+    def delete(self, row):
+        level = self.levels.pop(row['id'], None)
+        if level is None:
+            return
+        side, price = level
+        if self.sizes[side].pop(price, None) is not None:
+            ladder = self.ladders[side]
+            i = bisect_left(ladder, price)
+            if i < len(ladder) and ladder[i] == price:
+                del ladder[i]
+
+    @property
+    def best_bid(self):
+        ladder = self.ladders[BUY]
+        if not ladder:
+            return None
+        return ladder[-1], self.sizes[BUY][ladder[-1]]
+
+    @property
+    def best_ask(self):
+        ladder = self.ladders[SELL]
+        if not ladder:
+            return None
+        return ladder[0], self.sizes[SELL][ladder[0]]
+
+    def depth(self, n=10):
+        """Get ([(price, size)] of the top n bids, same of the top n asks)"""
+
+        bids = self.ladders[BUY][:-n - 1:-1] if n else []
+        asks = self.ladders[SELL][:n]
+        return (
+            [(p, self.sizes[BUY][p]) for p in bids],
+            [(p, self.sizes[SELL][p]) for p in asks],
+        )
+
+
+class OrderBooks(object):
+    """Order books of many symbols, fed by `orderBookL2` messages"""
+
+    TABLE = 'orderBookL2'
+
+    def __init__(self):
+        self.books = {}
+
+    def get(self, symbol):
+        return self.books.get(symbol)
+
+    def seed(self, client, symbol):
+        rows = client.get_order_book_l2(symbol, depth=0)
+        self.books[symbol] = OrderBook.from_snapshot(symbol, rows)
+        return self.books[symbol]
+
+    def handle(self, table, action, rows):
+        if table != self.TABLE:
+            return
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row['symbol']].append(row)
+        for symbol, symbol_rows in grouped.items():
+            book = self.books.get(symbol)
+            if book is None:
+                book = self.books[symbol] = OrderBook(symbol)
+            book.apply(action, symbol_rows)
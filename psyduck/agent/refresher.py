@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Refresher(object):
+    """Call `refresh` every `interval` seconds when run by a Scheduler"""
+
+    def __init__(self, refresh, interval, name='refresh'):
+        self.refresh = refresh
+        self.interval = interval
+        self.name = name
+        self.next_run = None
+        self.refreshing = False
+        self.last_refresh = None
+        self.last_duration = None
+        self.count = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def refresh_once(self):
+        """Run `refresh` once, a None result means another process did it"""
+
+        self.refreshing = True
+        start = time.monotonic()
+        try:
+            result = self.refresh()
+        except Exception:
+            self.errors += 1
+            logger.exception('%s failed', self.name)
+        else:
+            if result is None:
+                self.skipped += 1
+            else:
+                self.count += 1
+                self.last_refresh = time.time()
+        finally:
+            self.last_duration = time.monotonic() - start
+            self.refreshing = False
+
+    @property
+    def staleness(self):
+        if self.last_refresh is None:
+            return None
+        return time.time() - self.last_refresh
+
+    @property
+    def metrics(self):
+        return {
+            'refreshing': self.refreshing,
+            'count': self.count,
+            'errors': self.errors,
+            'skipped': self.skipped,
+            'last_duration': self.last_duration,
+            'staleness': self.staleness,
+        }
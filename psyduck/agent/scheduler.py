@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+from psyduck.agent.refresher import Refresher
+
+
+class Scheduler(object):
+    """Run Refresher jobs on fixed intervals from one thread
+
+    First runs are staggered evenly over the shortest interval so the jobs
+    do not fire at once and spend the rate limit in bursts.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.stopped = threading.Event()
+        self.thread = None
+        self.last_lag = 0
+        self.max_lag = 0
+
+    def add(self, name, fn, interval):
+        job = Refresher(fn, interval, name)
+        self.jobs.append(job)
+        return job
+
+    def spread(self, now):
+        if not self.jobs:
+            return
+        step = min(job.interval for job in self.jobs) / len(self.jobs)
+        for i, job in enumerate(self.jobs):
+            job.next_run = now + step * i
+
+    def run(self):
+        self.stopped.clear()
+        self.spread(time.monotonic())
+        while self.jobs and not self.stopped.is_set():
+            job = min(self.jobs, key=lambda j: j.next_run)
+            delay = job.next_run - time.monotonic()
+            if delay > 0 and self.stopped.wait(delay):
+                return
+            now = time.monotonic()
+            self.last_lag = max(0, now - job.next_run)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            job.refresh_once()
+            job.next_run = max(job.next_run + job.interval, now)
+
+    def start(self):
+        """Run the jobs on a daemon thread"""
+
+        if self.thread and self.thread.is_alive():
+            return self.thread
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        self.stopped.set()
+
+    @property
+    def metrics(self):
+        return {
+            'loop_lag': self.last_lag,
+            'max_loop_lag': self.max_lag,
+            'jobs': {job.name: job.metrics for job in self.jobs},
+        }
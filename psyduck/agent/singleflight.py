@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight(object):
+    """Run at most one call per key at a time, sharing its result
+
+    Callers arriving while a call for the same key is in flight wait for
+    it and get its result (or exception) instead of running their own.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+
+    def in_flight(self, key):
+        return key in self.calls
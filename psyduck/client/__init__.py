@@ -2,12 +2,15 @@
 
 import cfg
 
+from psyduck.lazy import Lazy
+
 from .client import bitmex
 from .exc import RequestError
+from .ratelimit import RateLimiter
 from .adapter import (
     BitmexAdapter,
 )
 
 
-raw_client = bitmex(cfg.CONFIG)
-client = BitmexAdapter(raw_client)
+raw_client = Lazy(lambda: bitmex(cfg.CONFIG))
+client = BitmexAdapter(raw_client, RateLimiter.from_config(cfg.CONFIG))
@@ -61,8 +61,16 @@ from psyduck.client.meta import RequestMeta
 
 
 class BitmexAdapter(metaclass=RequestMeta):
-    def __init__(self, client):
+    PAGINATED = ('get_chat', 'get_execution', 'get_execution_trade_history',
+                 'get_funding', 'get_instrument',
+                 'get_instrument_composite_index', 'get_insurance',
+                 'get_liquidation', 'get_orders', 'get_quote',
+                 'get_quote_bucketed', 'get_settlement', 'get_trade',
+                 'get_trade_bucketed', )
+
+    def __init__(self, client, limiter=None):
         self.client = client
+        self.limiter = limiter
 
     def get_announcement(self, columns=None):
         """
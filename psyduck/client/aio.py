@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import hmac
+import json
+import time
+from urllib.parse import urlencode
+
+import aiohttp
+from yarl import URL
+
+from psyduck.client.exc import RequestError
+from psyduck.client.http import compact
+from psyduck.client.ratelimit import RateLimiter
+
+
+class AsyncHTTPAdapter(object):
+    """Base class of the generated asyncio adapter
+
+    All requests share one aiohttp session, so a single event loop can keep
+    hundreds of calls in flight.
+    """
+
+    BASE_PATH = '/api/v1'
+    EXPIRES = 5
+
+    def __init__(self, host, api_key=None, api_secret=None, proxy=None,
+                 limit=100, timeout=None, limiter=None):
+        self.host = host
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.proxy = proxy
+        self.limit = limit
+        self.timeout = timeout
+        self.limiter = limiter
+        self.session = None
+
+    @classmethod
+    def from_config(cls, config):
+        proxies = config.PROXIES or {}
+        return cls(
+            config.HOST, config.API_KEY, config.API_SECRET,
+            proxy=proxies.get('https') or proxies.get('http'),
+            limit=config.POOL_MAXSIZE or 100,
+            timeout=config.READ_TIMEOUT,
+            limiter=RateLimiter.from_config(config),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def get_session(self):
+        if self.session is None or self.session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(limit=self.limit)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, path, path_params=None, query=None,
+                      form=None, body=None):
+        if path_params:
+            path = path.format(**path_params)
+        path = self.BASE_PATH + path
+        query = compact(query)
+        if query:
+            path = '{}?{}'.format(path, urlencode(query))
+        headers = {}
+        data = ''
+        if body is not None:
+            data = json_dumps(body)
+            headers['Content-Type'] = 'application/json'
+        elif form:
+            data = urlencode(compact(form) or {})
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.api_key and self.api_secret:
+            headers.update(self.sign(method, path, data))
+
+        async with self.get_session().request(
+            method, URL(self.host + path, encoded=True),
+            data=data or None, headers=headers, proxy=self.proxy,
+        ) as response:
+            if response.status >= 400:
+                raise RequestError(await error_message(response), response)
+            if response.content_length == 0:
+                return None, response
+            return await response.json(content_type=None), response
+
+    def sign(self, method, path, data):
+        expires = str(int(time.time()) + self.EXPIRES)
+        message = (method + path + expires + data).encode('utf-8')
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'), message, hashlib.sha256
+        ).hexdigest()
+        return {
+            'api-expires': expires,
+            'api-key': self.api_key,
+            'api-signature': signature,
+        }
+
+
+def json_dumps(value):
+    return json.dumps(value, separators=(',', ':'))
+
+
+async def error_message(response):
+    try:
+        return (await response.json(content_type=None))['error']['message']
+    except (ValueError, KeyError, TypeError):
+        return '{} {}'.format(response.status, response.reason)
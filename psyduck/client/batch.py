@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+from concurrent.futures import Future
+
+from psyduck.client.exc import RequestError
+from psyduck.client.http import camel_format
+
+NEW = 'new'
+AMEND = 'amend'
+CANCEL = 'cancel'
+
+
+class OrderBatcher(object):
+    """Coalesce single order mutations into bulk requests
+
+    Calls for the same action and symbol that arrive within `window`
+    seconds, or until `size` of them are queued, are sent as one
+    new_order_bulk / amend_order_bulk / cancel_order request. Each caller
+    gets a future resolved with its own order row.
+    """
+
+    def __init__(self, adapter, window=0.005, size=10):
+        self.adapter = adapter
+        self.window = window
+        self.size = size
+        self.lock = threading.Lock()
+        self.batches = {}
+        self.timers = {}
+
+    @classmethod
+    def from_config(cls, adapter, config):
+        return cls(adapter, config.BATCH_WINDOW, config.BATCH_SIZE)
+
+    def new_order(self, symbol, **kwargs):
+        kwargs['symbol'] = symbol
+        return self.submit(NEW, symbol, kwargs)
+
+    def amend_order(self, symbol, **kwargs):
+        return self.submit(AMEND, symbol, kwargs)
+
+    def cancel_order(self, order_id=None, cl_ord_id=None):
+        if not order_id and not cl_ord_id:
+            raise ValueError('order_id or cl_ord_id is required')
+        return self.submit(
+            CANCEL, None, {'order_id': order_id, 'cl_ord_id': cl_ord_id}
+        )
+
+    def submit(self, action, symbol, order):
+        key = (action, symbol)
+        future = Future()
+        order = {camel_format(k): v for k, v in order.items() if v is not None}
+        with self.lock:
+            batch = self.batches.setdefault(key, [])
+            batch.append((order, future))
+            full = len(batch) >= self.size
+            if not full and len(batch) == 1:
+                timer = threading.Timer(self.window, self.flush, (key,))
+                timer.daemon = True
+                self.timers[key] = timer
+                timer.start()
+        if full:
+            self.flush(key)
+        return future
+
+    def flush(self, key):
+        with self.lock:
+            batch = self.batches.pop(key, None)
+            timer = self.timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        if not batch:
+            return
+        action = key[0]
+        try:
+            if action == CANCEL:
+                self.send_cancel(batch)
+            else:
+                self.send_bulk(action, batch)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def flush_all(self):
+        with self.lock:
+            keys = list(self.batches)
+        for key in keys:
+            self.flush(key)
+
+    def send_bulk(self, action, batch):
+        orders = json.dumps([order for order, _ in batch])
+        if action == NEW:
+            rows = self.adapter.new_order_bulk(orders=orders)
+        else:
+            rows = self.adapter.amend_order_bulk(orders=orders)
+        if len(rows) != len(batch):
+            raise RequestError(
+                'expected {} rows, got {}'.format(len(batch), len(rows))
+            )
+        for (_, future), row in zip(batch, rows):
+            future.set_result(row)
+
+    def send_cancel(self, batch):
+        order_ids = [o['orderID'] for o, _ in batch if 'orderID' in o]
+        cl_ord_ids = [o['clOrdID'] for o, _ in batch if 'clOrdID' in o]
+        rows = self.adapter.cancel_order(
+            order_id=json.dumps(order_ids) if order_ids else None,
+            cl_ord_id=json.dumps(cl_ord_ids) if cl_ord_ids else None,
+        )
+        by_order_id = {row['orderID']: row for row in rows
+                       if row.get('orderID')}
+        by_cl_ord_id = {row['clOrdID']: row for row in rows
+                        if row.get('clOrdID')}
+        for order, future in batch:
+            row = by_order_id.get(order.get('orderID')) or \
+                by_cl_ord_id.get(order.get('clOrdID'))
+            if row is None:
+                future.set_exception(RequestError('order not cancelled'))
+            else:
+                future.set_result(row)
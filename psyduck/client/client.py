@@ -1,20 +1,108 @@
 # -*- coding: utf-8 -*-
 
+import socket
+
 from bravado.client import SwaggerClient
 from bravado.requests_client import RequestsClient
 from BitMEXAPIKeyAuthenticator import APIKeyAuthenticator
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from psyduck.client.decoder import DecodedHttpFuture, get_decoder
+from psyduck.client.spec import load_spec_dict
+
+
+class PoolAdapter(HTTPAdapter):
+
+    def __init__(self, socket_options=None, timeout=None, **kwargs):
+        self.socket_options = socket_options
+        self.timeout = timeout
+        super(PoolAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs['socket_options'] = self.socket_options
+        super(PoolAdapter, self).init_poolmanager(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super(PoolAdapter, self).send(
+            request, timeout=self.default_timeout(timeout), **kwargs
+        )
+
+    def default_timeout(self, timeout):
+        if timeout is None:
+            return self.timeout
+        if self.timeout is None or not isinstance(timeout, tuple):
+            return timeout
+        connect, read = timeout
+        return (
+            self.timeout[0] if connect is None else connect,
+            self.timeout[1] if read is None else read,
+        )
 
 
 class ProxyClient(RequestsClient):
 
     def __init__(self, proxies=None):
         super(ProxyClient, self).__init__()
+        self.loads = None
         if proxies:
             self.update_proxies(proxies)
 
+    @classmethod
+    def from_config(cls, config):
+        client = cls(config.PROXIES)
+        client.mount_pool(
+            pool_connections=config.POOL_CONNECTIONS,
+            pool_maxsize=config.POOL_MAXSIZE,
+            pool_block=bool(config.POOL_BLOCK),
+            max_retries=config.MAX_RETRIES or 0,
+            keepalive=config.TCP_KEEPALIVE,
+            keepalive_idle=config.TCP_KEEPALIVE_IDLE,
+            timeout=(config.CONNECT_TIMEOUT, config.READ_TIMEOUT),
+        )
+        if config.JSON_DECODER:
+            client.loads = get_decoder(config.JSON_DECODER)
+        return client
+
     def update_proxies(self, proxies):
         self.session.proxies.update(proxies)
 
+    def mount_pool(self, pool_connections=10, pool_maxsize=10,
+                   pool_block=False, max_retries=0, keepalive=False,
+                   keepalive_idle=None, timeout=None):
+        adapter = PoolAdapter(
+            socket_options=keepalive_options(keepalive_idle)
+            if keepalive else None,
+            timeout=timeout,
+            pool_connections=pool_connections or 10,
+            pool_maxsize=pool_maxsize or 10,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, request_params, operation=None, request_config=None):
+        future = super(ProxyClient, self).request(
+            request_params, operation, request_config
+        )
+        if self.loads is None or operation is None:
+            return future
+        return DecodedHttpFuture(
+            future.future, future.response_adapter, future.operation,
+            future.request_config, loads=self.loads,
+        )
+
+
+def keepalive_options(idle=None):
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if idle and hasattr(socket, 'TCP_KEEPIDLE'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle))
+    return options
+
 
 def bitmex(config):
     swagger_config = {
@@ -24,12 +112,27 @@ def bitmex(config):
     }
 
     spec_url = config.HOST + config.SWAGGER_PATH
-    client = ProxyClient(config.PROXIES)
+    client = ProxyClient.from_config(config)
+    client.authenticator = authenticator(config)
 
-    if config.api_key and config.api_secret:
-        client.authenticator = APIKeyAuthenticator(
-            config.HOST, config.API_KEY, config.API_SECRET
+    if not config.SWAGGER_CACHE_PATH:
+        return SwaggerClient.from_url(
+            spec_url, config=swagger_config, http_client=client
         )
-    return SwaggerClient.from_url(
-        spec_url, config=swagger_config, http_client=client
+
+    spec_dict = load_spec_dict(
+        client.session, spec_url, config.SWAGGER_CACHE_PATH,
+        revalidate=config.SWAGGER_REVALIDATE,
+    )
+    return SwaggerClient.from_spec(
+        spec_dict, origin_url=spec_url, config=swagger_config,
+        http_client=client,
     )
+
+
+def authenticator(config):
+    if config.API_KEY and config.API_SECRET:
+        return APIKeyAuthenticator(
+            config.HOST, config.API_KEY, config.API_SECRET
+        )
+    return None
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timezone
+
+import numpy
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+DATETIME = 'datetime64[ms]'
+
+
+def to_columns(rows, types=None):
+    """Convert a list of decoded rows into a dict of typed numpy arrays
+
+    Columns are built one at a time, so besides the rows themselves only one
+    column's list of values is held while the arrays are filled.
+
+    :param rows: rows as returned by a table endpoint
+    :param types: column name -> dtype, inferred from the rows if omitted
+    """
+
+    names = list(types) if types else []
+    seen = set(names)
+    for row in rows:
+        for name in row:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    types = types or {}
+    columns = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        columns[name] = to_array(
+            values, types.get(name) or infer_dtype(values)
+        )
+    return columns
+
+
+def infer_dtype(values):
+    """Pick a dtype holding every value exactly, int and float give float64"""
+
+    kinds = {kind_of(value) for value in values if value is not None}
+    if not kinds:
+        return 'object'
+    if len(kinds) == 1:
+        return kinds.pop()
+    if kinds == {'int64', 'float64'}:
+        return 'float64'
+    return 'object'
+
+
+def kind_of(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int64'
+    if isinstance(value, float):
+        return 'float64'
+    if isinstance(value, datetime):
+        return DATETIME
+    return 'object'
+
+
+def to_array(values, dtype):
+    if dtype == DATETIME:
+        return numpy.array(
+            [to_datetime(v) for v in values], dtype=DATETIME
+        )
+    if dtype == 'int64' and any(isinstance(v, float) for v in values):
+        dtype = 'float64'
+    if None in values:
+        if dtype == 'int64' or dtype == 'float64':
+            return numpy.array(
+                [numpy.nan if v is None else v for v in values],
+                dtype='float64',
+            )
+        dtype = 'object'
+    return numpy.array(values, dtype=dtype)
+
+
+def to_datetime(value):
+    if value is None:
+        return 'NaT'
+    if isinstance(value, str):
+        return datetime.strptime(value, TIME_FORMAT)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import importlib
+
+from bravado.http_future import HttpFuture
+
+
+def get_decoder(name=None):
+    """Get the `loads` function of a JSON module, eg: json, orjson, ujson"""
+
+    return importlib.import_module(name or 'json').loads
+
+
+class DecodedHttpFuture(HttpFuture):
+    """HttpFuture decoding successful responses with a fast JSON decoder
+
+    Skips bravado-core's response unmarshalling, which only converts formats
+    when models are disabled, so date-time fields stay ISO strings.
+    """
+
+    def __init__(self, *args, loads=None, **kwargs):
+        super(DecodedHttpFuture, self).__init__(*args, **kwargs)
+        self.loads = loads
+
+    def _get_swagger_result(self, incoming_response):
+        if self.operation is not None and \
+                200 <= incoming_response.status_code < 300 and \
+                not self.operation.swagger_spec.config['use_models']:
+            content = incoming_response.raw_bytes
+            return self.loads(content) if content else None
+        return super(DecodedHttpFuture, self)._get_swagger_result(
+            incoming_response
+        )
@@ -3,3 +3,7 @@
 
 class RequestError(Exception):
     """API RequestError"""
+
+    def __init__(self, message, response=None):
+        super(RequestError, self).__init__(message)
+        self.response = response
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import io
+from collections import namedtuple
+
+from psyduck.client.exc import RequestError
+from psyduck.client.http import HTTPAdapter, camel_format, error_message
+from psyduck.client.paginate import PAGE_SIZE
+from psyduck.client.ratelimit import READ
+
+TABLES = {
+    'get_trade': '/trade',
+    'get_quote': '/quote',
+    'get_funding': '/funding',
+    'get_settlement': '/settlement',
+    'get_execution_trade_history': '/execution/tradeHistory',
+}
+
+
+class CSVExporter(HTTPAdapter):
+    """Bulk export of table endpoints over BitMEX's `_format=csv` transport
+
+    Responses are parsed while they stream in, so a page is never buffered
+    as a whole and rows never go through JSON.
+    """
+
+    def export(self, method, page_size=PAGE_SIZE, start=0, **kwargs):
+        """Yield every row of a table as a namedtuple
+
+        :param method: adapter method name, one of TABLES
+        :param page_size: rows per request
+        :param start: offset of the first row
+        :param kwargs: snake_case filters of the adapter method
+        """
+
+        path = TABLES[method]
+        query = {camel_format(k): v for k, v in kwargs.items()}
+        query['_format'] = 'csv'
+        while True:
+            query.update(count=page_size, start=start)
+            count = 0
+            for row in self.stream(path, query):
+                count += 1
+                yield row
+            start += count
+            if count < page_size:
+                return
+
+    def stream(self, path, query):
+        if self.limiter:
+            self.limiter.acquire(READ)
+        prepared = self.prepare('GET', path, query=query)
+        response = self.session.send(
+            prepared, stream=True, timeout=self.timeout
+        )
+        try:
+            if self.limiter:
+                self.limiter.update(READ, response)
+            if not response.ok:
+                raise RequestError(error_message(response), response)
+            response.raw.decode_content = True
+            reader = csv.reader(
+                io.TextIOWrapper(response.raw, encoding='utf-8', newline='')
+            )
+            header = next(reader, None)
+            if not header:
+                return
+            row_type = namedtuple('Row', header, rename=True)
+            for values in reader:
+                yield row_type(*values)
+        finally:
+            response.close()
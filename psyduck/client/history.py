@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from queue import Full, Queue
+
+from psyduck.client.paginate import PAGE_SIZE, paginate
+
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+DONE = object()
+
+
+def download(method, start_time, end_time, shards=8, workers=4,
+             buffer=PAGE_SIZE, **kwargs):
+    """Fetch the rows of [start_time, end_time) in parallel time shards
+
+    At most `workers` shards are paged at a time (calls still go through
+    the adapter's rate limiter). Each shard streams into a queue of at most
+    `buffer` rows and shards are yielded in timestamp order, so memory stays
+    bounded however long the range is. Rows are clipped to their shard's
+    half-open range, so rows on a shard boundary are returned exactly once.
+    """
+
+    start_time, end_time = as_utc(start_time), as_utc(end_time)
+    bounds = iter(split_range(start_time, end_time, shards))
+    running = deque()
+    stop = threading.Event()
+
+    def put(queue, item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def fetch(bound, queue):
+        lower, upper = bound
+        try:
+            rows = paginate(
+                method, start_time=lower, end_time=upper, prefetch=False,
+                **kwargs
+            )
+            for row in rows:
+                if lower <= row_time(row) < upper and not put(queue, row):
+                    return
+        except Exception as exc:
+            put(queue, exc)
+        else:
+            put(queue, DONE)
+
+    def submit():
+        bound = next(bounds, None)
+        if bound is not None:
+            queue = Queue(buffer)
+            executor.submit(fetch, bound, queue)
+            running.append(queue)
+
+    executor = ThreadPoolExecutor(workers)
+    try:
+        for _ in range(workers):
+            submit()
+        while running:
+            item = running[0].get()
+            if item is DONE:
+                running.popleft()
+                submit()
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
+
+
+def split_range(start_time, end_time, shards):
+    step = (end_time - start_time) / max(shards, 1)
+    bounds = []
+    lower = start_time
+    for i in range(1, shards):
+        upper = start_time + step * i
+        bounds.append((lower, upper))
+        lower = upper
+    bounds.append((lower, end_time))
+    return [b for b in bounds if b[0] < b[1]]
+
+
+def row_time(row):
+    value = row['timestamp']
+    if isinstance(value, str):
+        value = datetime.strptime(value, TIME_FORMAT)
+    return as_utc(value)
+
+
+def as_utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+import requests
+
+from psyduck.client.client import ProxyClient, authenticator
+from psyduck.client.decoder import get_decoder
+from psyduck.client.exc import RequestError
+from psyduck.client.ratelimit import RateLimiter
+
+
+class HTTPAdapter(object):
+    """Base class of the generated direct-HTTP adapters
+
+    Generated methods build the path, query and form parameters at codegen
+    time and call `request`, so no swagger spec is loaded at runtime.
+    """
+
+    BASE_PATH = '/api/v1'
+
+    def __init__(self, session, host, authenticator=None, timeout=None,
+                 limiter=None, loads=None):
+        self.session = session
+        self.host = host
+        self.authenticator = authenticator
+        self.timeout = timeout
+        self.limiter = limiter
+        self.loads = loads or get_decoder()
+
+    @classmethod
+    def from_config(cls, config):
+        client = ProxyClient.from_config(config)
+        return cls(
+            client.session, config.HOST, authenticator(config),
+            limiter=RateLimiter.from_config(config),
+            loads=get_decoder(config.JSON_DECODER),
+        )
+
+    def request(self, method, path, path_params=None, query=None, form=None,
+                body=None):
+        prepared = self.prepare(method, path, path_params, query, form, body)
+        response = self.session.send(prepared, timeout=self.timeout)
+        if not response.ok:
+            raise RequestError(error_message(response), response)
+        return self.decode(response), response
+
+    def prepare(self, method, path, path_params=None, query=None, form=None,
+                body=None):
+        if path_params:
+            path = path.format(**path_params)
+        url = self.host + self.BASE_PATH + path
+        req = requests.Request(
+            method, url, params=compact(query), data=compact(form), json=body
+        )
+        if self.authenticator and self.authenticator.matches(url):
+            req = self.authenticator.apply(req)
+        return self.session.prepare_request(req)
+
+    def decode(self, response):
+        if not response.content:
+            return None
+        return self.loads(response.content)
+
+
+def compact(params):
+    if not params:
+        return None
+    result = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        result[key] = value
+    return result
+
+
+def camel_format(name):
+    """Convert adapter keyword names to BitMEX field names
+    eg:
+    cl_ord_id -> clOrdID
+    exec_inst -> execInst
+    """
+
+    head, *tail = name.split('_')
+    string = head + ''.join(word.capitalize() for word in tail)
+    return re.sub('Id(?=[A-Z]|$)', 'ID', string)
+
+
+def error_message(response):
+    try:
+        return response.json()['error']['message']
+    except (ValueError, KeyError, TypeError):
+        return '{} {}'.format(response.status_code, response.reason)
@@ -1,23 +1,74 @@
 # -*- coding: utf-8 -*-
 
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 from bravado.exception import HTTPError
 
+import cfg
 from psyduck.client.exc import (
     RequestError
 )
+from psyduck.client.ratelimit import request_kind
+from psyduck.lazy import Lazy
+
+
+executor = Lazy(lambda: ThreadPoolExecutor(cfg.CONFIG.FUTURE_WORKERS))
 
 
 def request_deco(fn):
+    if inspect.iscoroutinefunction(fn):
+        return async_request_deco(fn)
+
+    kind = request_kind(fn.__name__)
 
     @wraps(fn)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, wait=True, as_columns=False, **kwargs):
+        if not wait:
+            return executor.submit(
+                wrapper, self, *args, as_columns=as_columns, **kwargs
+            )
+        limiter = getattr(self, 'limiter', None)
+        if limiter:
+            limiter.acquire(kind)
         try:
-            result = fn(*args, **kwargs)
+            result = fn(self, *args, **kwargs)
         except HTTPError as exc:
-            raise RequestError(exc.message)
+            if limiter:
+                limiter.update(kind, exc.response)
+            raise RequestError(exc.message, exc.response)
+        except RequestError as exc:
+            if limiter:
+                limiter.update(kind, exc.response)
+            raise
         data, response = result
+        if limiter:
+            limiter.update(kind, response)
+        if as_columns:
+            from psyduck.client.columns import to_columns
+            types = getattr(self, 'COLUMN_TYPES', {}).get(fn.__name__)
+            return to_columns(data, types)
+        return data
+    return wrapper
+
+
+def async_request_deco(fn):
+    kind = request_kind(fn.__name__)
+
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        limiter = getattr(self, 'limiter', None)
+        if limiter:
+            await limiter.acquire_async(kind)
+        try:
+            data, response = await fn(self, *args, **kwargs)
+        except RequestError as exc:
+            if limiter:
+                limiter.update(kind, exc.response)
+            raise
+        if limiter:
+            limiter.update(kind, response)
         return data
     return wrapper
 
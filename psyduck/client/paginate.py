@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 500
+
+
+def paginate(method, page_size=PAGE_SIZE, start=0, prefetch=True, **kwargs):
+    """Lazily yield every row of a count/start table endpoint
+
+    :param method: bound adapter method listed in the adapter's PAGINATED
+    :param page_size: rows per request, BitMEX allows at most 500
+    :param start: offset of the first row
+    :param prefetch: fetch the next page while the current one is consumed
+    """
+
+    adapter = getattr(method, '__self__', None)
+    if method.__name__ not in getattr(adapter, 'PAGINATED', ()):
+        raise ValueError('{} is not paginated'.format(method.__name__))
+
+    def fetch(offset):
+        return method(count=page_size, start=offset, **kwargs)
+
+    executor = ThreadPoolExecutor(1) if prefetch else None
+    try:
+        page = fetch(start)
+        while page:
+            start += len(page)
+            last = len(page) < page_size
+            future = None
+            if executor and not last:
+                future = executor.submit(fetch, start)
+            for row in page:
+                yield row
+            if last:
+                return
+            page = future.result() if future else fetch(start)
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
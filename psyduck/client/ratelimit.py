@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+
+from psyduck.redis import cache_client
+
+READ = 'read'
+ORDER = 'order'
+
+ORDER_PREFIXES = ('new_order', 'amend_order', 'cancel_order', 'close_order')
+
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'blocked')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local blocked = tonumber(state[3]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if now < blocked then
+    wait = blocked - now
+elseif tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'updated', now,
+           'blocked', blocked)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return tostring(wait)
+"""
+
+UPDATE_SCRIPT = """
+local remaining = tonumber(ARGV[1])
+local reset = tonumber(ARGV[2])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens == nil or remaining < tokens then
+    redis.call('HSET', KEYS[1], 'tokens', remaining)
+end
+if remaining <= 0 then
+    local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked')) or 0
+    redis.call('HSET', KEYS[1], 'blocked', math.max(blocked, reset))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+def request_kind(name):
+    return ORDER if name.startswith(ORDER_PREFIXES) else READ
+
+
+class TokenBucket(object):
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.time()
+        self.blocked = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def reserve(self):
+        with self.lock:
+            return self.take(time.time())
+
+    def take(self, now):
+        elapsed = max(0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+        if now < self.blocked:
+            return self.blocked - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def update(self, remaining, reset):
+        with self.lock:
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0:
+                self.blocked = max(self.blocked, reset)
+
+
+class RedisTokenBucket(object):
+    """Token bucket shared through Redis by every process using one key"""
+
+    def __init__(self, redis, key, rate, capacity):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.expire = int(capacity / rate) + 60
+        self.take_script = redis.register_script(TAKE_SCRIPT)
+        self.update_script = redis.register_script(UPDATE_SCRIPT)
+
+    def acquire(self):
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def reserve(self):
+        return float(self.take_script(
+            keys=[self.key],
+            args=[self.rate, self.capacity, time.time(), self.expire],
+        ))
+
+    def update(self, remaining, reset):
+        self.update_script(
+            keys=[self.key], args=[remaining, reset, self.expire]
+        )
+
+
+class RateLimiter(object):
+    """Paces adapter calls using BitMEX X-RateLimit-* response headers"""
+
+    KEY = 'ratelimit:{}:{}'
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+
+    @classmethod
+    def from_config(cls, config):
+        backend = config.RATE_LIMIT_BACKEND
+        if not backend:
+            return None
+        buckets = {}
+        for kind, (rate, capacity) in config.RATE_LIMITS.items():
+            if backend == 'redis':
+                key = cls.KEY.format(config.API_KEY or 'public', kind)
+                buckets[kind] = RedisTokenBucket(
+                    cache_client, key, rate, capacity
+                )
+            else:
+                buckets[kind] = TokenBucket(rate, capacity)
+        return cls(buckets)
+
+    def acquire(self, kind):
+        bucket = self.buckets.get(kind)
+        if bucket:
+            bucket.acquire()
+
+    async def acquire_async(self, kind):
+        bucket = self.buckets.get(kind)
+        while bucket:
+            wait = bucket.reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def update(self, kind, response):
+        # BitMEX reports one limit per account, so every bucket follows it
+        headers = getattr(response, 'headers', None)
+        if not self.buckets or not headers:
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        reset = headers.get('X-RateLimit-Reset')
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None:
+            reset = time.time() + float(retry_after)
+        for bucket in self.buckets.values():
+            bucket.update(int(remaining), float(reset or 0))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+import requests
+
+
+def load_spec_dict(session, spec_url, path=None, revalidate=True):
+    """Load swagger.json, using an on-disk copy revalidated by ETag"""
+
+    cached = read_cache(path) if path else None
+    if cached and not revalidate:
+        return cached['spec']
+
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = session.get(spec_url, headers=headers)
+    except requests.RequestException:
+        if cached:
+            return cached['spec']
+        raise
+
+    if cached and not 200 <= response.status_code < 300:
+        return cached['spec']
+    response.raise_for_status()
+    spec = response.json()
+    if path:
+        write_cache(path, {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'spec': spec,
+        })
+    return spec
+
+
+def read_cache(path):
+    try:
+        with open(path, mode='r', encoding='utf-8') as fp:
+            return json.load(fp)
+    except (IOError, ValueError):
+        return None
+
+
+def write_cache(path, value):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp, mode='w', encoding='utf-8') as fp:
+        json.dump(value, fp)
+    os.replace(tmp, path)
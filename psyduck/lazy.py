@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+
+class Lazy(object):
+    """Build an object on first attribute access, once per process"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._instance = self._factory()
+        return instance
+
+    def reset(self):
+        with self._lock:
+            self._instance = None
+
+    @property
+    def initialized(self):
+        return self._instance is not None
+
+    def __getattr__(self, item):
+        return getattr(self.get(), item)
@@ -1,6 +1,37 @@
 # -*- coding: utf-8 -*-
-from redis import Redis
+from urllib.parse import urlparse
+
+from redis import BlockingConnectionPool, Redis
+from redis.connection import HiredisParser, PythonParser
+from redis.utils import HIREDIS_AVAILABLE
 
 import cfg
+from psyduck.lazy import Lazy
+
+
+def create_client(config):
+    """Build a Redis client over a bounded, blocking connection pool
+
+    REDIS_URI may also be a unix socket, eg: unix:///tmp/redis.sock?db=0
+    """
+
+    kwargs = {
+        'max_connections': config.REDIS_MAX_CONNECTIONS,
+        'timeout': config.REDIS_POOL_TIMEOUT,
+        'socket_timeout': config.REDIS_SOCKET_TIMEOUT,
+        'retry_on_timeout': bool(config.REDIS_RETRY_ON_TIMEOUT),
+    }
+    # UnixDomainSocketConnection rejects the TCP-only options
+    if urlparse(config.REDIS_URI).scheme != 'unix':
+        kwargs['socket_connect_timeout'] = config.REDIS_CONNECT_TIMEOUT
+        kwargs['socket_keepalive'] = bool(config.REDIS_KEEPALIVE)
+    # redis-py already defaults to hiredis when it is installed
+    if config.REDIS_HIREDIS and HIREDIS_AVAILABLE:
+        kwargs['parser_class'] = HiredisParser
+    else:
+        kwargs['parser_class'] = PythonParser
+    pool = BlockingConnectionPool.from_url(config.REDIS_URI, **kwargs)
+    return Redis(connection_pool=pool)
+
 
-cache_client = Redis.from_url(cfg.CONFIG.REDIS_URI)
+cache_client = Lazy(lambda: create_client(cfg.CONFIG))
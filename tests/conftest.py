@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import fakeredis
+import pytest
+
+from psyduck.agent import distributor as distributor_module
+from psyduck.agent import mirror
+from psyduck.agent.cache import TTLCache
+from psyduck.agent.distributor import Distributor
+from psyduck.agent.singleflight import SingleFlight
+
+
+class FakeClient(object):
+    """Stands in for the adapter, serving get_instrument_active rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def get_instrument_active(self):
+        self.calls += 1
+        return [dict(row) for row in self.rows]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.FakeStrictRedis()
+    client.flushall()
+    monkeypatch.setattr(distributor_module, 'cache_client', client)
+    monkeypatch.setattr(mirror, 'cache_client', client)
+    yield client
+    client.flushall()
+
+
+@pytest.fixture
+def distributor(monkeypatch, redis):
+    """Distributor with fresh class state over a fake Redis"""
+
+    for name, value in (
+            ('local_cache', TTLCache(1024, 60)),
+            ('missing', TTLCache(1024, 30)),
+            ('flight', SingleFlight()),
+            ('symbols', {}),
+            ('snapshot', {}),
+            ('indexed_at', None),
+            ('publisher', False),
+            ('feed', None),
+            ('write_stats', {'sets': 0, 'expires': 0, 'rewrites': 0}),
+            ('updated_at', {}),
+    ):
+        monkeypatch.setattr(Distributor, name, value)
+    monkeypatch.setattr(distributor_module, 'client', FakeClient([
+        {'symbol': 'XBTUSD', 'lastPrice': 6500.0, 'bidPrice': 6499.5,
+         'askPrice': 6500.5},
+        {'symbol': 'ETHUSD', 'lastPrice': 450.0, 'bidPrice': 449.95,
+         'askPrice': 450.05},
+    ]))
+    return Distributor
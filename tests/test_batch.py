@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+import pytest
+
+from psyduck.client.batch import OrderBatcher
+from psyduck.client.exc import RequestError
+
+
+class Adapter(object):
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def new_order_bulk(self, orders):
+        orders = json.loads(orders)
+        with self.lock:
+            self.calls.append(('new', orders))
+        return [dict(order, orderID='id-{}'.format(i))
+                for i, order in enumerate(orders)]
+
+    def amend_order_bulk(self, orders):
+        orders = json.loads(orders)
+        with self.lock:
+            self.calls.append(('amend', orders))
+        return orders[:-1]
+
+    def cancel_order(self, order_id=None, cl_ord_id=None):
+        self.calls.append(('cancel', order_id, cl_ord_id))
+        rows = [{'orderID': i} for i in json.loads(order_id or '[]')]
+        rows += [{'clOrdID': i} for i in json.loads(cl_ord_id or '[]')]
+        return [row for row in rows if 'missing' not in row.values()]
+
+
+def test_orders_in_one_window_share_a_bulk_request():
+    adapter = Adapter()
+    batcher = OrderBatcher(adapter, window=0.05, size=10)
+
+    futures = [
+        batcher.new_order('XBTUSD', order_qty=i, cl_ord_id='c{}'.format(i))
+        for i in range(1, 4)
+    ]
+
+    rows = [f.result(timeout=2) for f in futures]
+    assert adapter.calls == [('new', [
+        {'symbol': 'XBTUSD', 'orderQty': i, 'clOrdID': 'c{}'.format(i)}
+        for i in range(1, 4)
+    ])]
+    assert [row['orderID'] for row in rows] == ['id-0', 'id-1', 'id-2']
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    adapter = Adapter()
+    batcher = OrderBatcher(adapter, window=60, size=2)
+
+    futures = [batcher.new_order('XBTUSD', order_qty=1) for _ in range(2)]
+
+    assert [f.result(timeout=2)['orderID'] for f in futures] == \
+        ['id-0', 'id-1']
+
+
+def test_symbols_are_batched_separately():
+    adapter = Adapter()
+    batcher = OrderBatcher(adapter, window=60, size=10)
+
+    batcher.new_order('XBTUSD', order_qty=1)
+    batcher.new_order('ETHUSD', order_qty=1)
+    batcher.flush_all()
+
+    assert sorted(c[1][0]['symbol'] for c in adapter.calls) == \
+        ['ETHUSD', 'XBTUSD']
+
+
+def test_row_count_mismatch_fails_every_future():
+    batcher = OrderBatcher(Adapter(), window=60, size=10)
+
+    futures = [batcher.amend_order('XBTUSD', order_id=str(i), price=1)
+               for i in range(2)]
+    batcher.flush_all()
+
+    for future in futures:
+        with pytest.raises(RequestError):
+            future.result(timeout=2)
+
+
+def test_cancel_matches_rows_by_id():
+    adapter = Adapter()
+    batcher = OrderBatcher(adapter, window=60, size=10)
+
+    by_id = batcher.cancel_order(order_id='a')
+    by_cl_id = batcher.cancel_order(cl_ord_id='b')
+    missing = batcher.cancel_order(order_id='missing')
+    batcher.flush_all()
+
+    assert adapter.calls == [('cancel', '["a", "missing"]', '["b"]')]
+    assert by_id.result(timeout=2) == {'orderID': 'a'}
+    assert by_cl_id.result(timeout=2) == {'clOrdID': 'b'}
+    with pytest.raises(RequestError):
+        missing.result(timeout=2)
+    with pytest.raises(ValueError):
+        batcher.cancel_order()
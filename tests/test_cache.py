@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from psyduck.agent.cache import TTLCache
+
+
+def test_get_and_expiry():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.06)
+    assert cache.get('a') is None
+    assert cache.get('a', 'default') == 'default'
+    assert cache.stats == {'hits': 1, 'misses': 2, 'size': 1}
+
+
+def test_per_entry_ttl():
+    cache = TTLCache(ttl=60)
+
+    cache.set('a', 1, ttl=0)
+
+    assert cache.get('a') is None
+
+
+def test_stale_values_outlive_expiry():
+    cache = TTLCache(ttl=0)
+
+    cache.set('a', 1)
+
+    assert cache.get('a') is None
+    assert cache.get_stale('a') == 1
+    assert cache.get_stale('b', 2) == 2
+
+
+def test_age_counts_from_the_given_age():
+    cache = TTLCache()
+
+    cache.set('a', 1, age=5)
+    value, age = cache.get_with_age('a')
+
+    assert value == 1 and 5 <= age < 6
+    assert cache.get_with_age('b') == (None, None)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_delete_and_clear():
+    cache = TTLCache()
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.delete('a')
+    cache.delete('missing')
+    assert cache.get('a') is None
+    cache.clear()
+    assert cache.stats['size'] == 0
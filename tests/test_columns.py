@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+import numpy
+import pytest
+
+from psyduck.client.columns import DATETIME, infer_dtype, to_columns
+
+
+def test_whole_prices_sent_as_ints_are_not_truncated():
+    columns = to_columns([{'price': 6500}, {'price': 6500.5}])
+
+    assert columns['price'].dtype == numpy.float64
+    assert columns['price'].tolist() == [6500.0, 6500.5]
+
+
+def test_declared_int_column_with_floats_is_widened():
+    columns = to_columns([{'size': 1}, {'size': 2.5}], {'size': 'int64'})
+
+    assert columns['size'].tolist() == [1.0, 2.5]
+
+
+@pytest.mark.parametrize('values, dtype', [
+    ([1, 2, None], 'int64'),
+    ([1, 2.5], 'float64'),
+    ([True, False], 'bool'),
+    ([1, True], 'object'),
+    ([1, 'a'], 'object'),
+    ([None, None], 'object'),
+    ([datetime(2018, 8, 1)], DATETIME),
+])
+def test_infer_dtype(values, dtype):
+    assert infer_dtype(values) == dtype
+
+
+def test_missing_values():
+    columns = to_columns([
+        {'size': 1, 'side': 'Buy'},
+        {'size': None, 'side': None, 'extra': 3},
+    ])
+
+    assert numpy.isnan(columns['size'][1])
+    assert columns['side'].tolist() == ['Buy', None]
+    assert numpy.isnan(columns['extra'][0])
+
+
+def test_timestamps():
+    columns = to_columns(
+        [{'timestamp': '2018-08-01T00:00:01.500Z'}, {'timestamp': None}],
+        {'timestamp': DATETIME},
+    )
+
+    assert str(columns['timestamp'][0]) == '2018-08-01T00:00:01.500'
+    assert numpy.isnat(columns['timestamp'][1])
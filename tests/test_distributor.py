@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+from cfg import CONFIG
+from psyduck.agent import codec
+from psyduck.agent import distributor as distributor_module
+from psyduck.agent.distributor import Instrument, as_bytes
+from psyduck.agent.mirror import InstrumentMirror
+
+XBT = Instrument('XBTUSD', 6500.0, 6499.5, 6500.5)
+ETH = Instrument('ETHUSD', 450.0, 449.95, 450.05)
+
+
+def count_calls(monkeypatch, target, name):
+    calls = []
+    method = getattr(target, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, counted)
+    return calls
+
+
+def test_new_values_are_set(redis, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+
+    key, value = distributor.encode_instrument(XBT)
+    assert redis.get(key) == as_bytes(value)
+    assert 0 < redis.ttl(key) <= CONFIG.REAL_TIME_EXPIRE
+    assert distributor.write_stats == {'sets': 2, 'expires': 0, 'rewrites': 0}
+
+
+def test_unchanged_values_only_get_expire(monkeypatch, redis, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+    key, _ = distributor.encode_instrument(XBT)
+    redis.expire(key, 1)
+    sets = count_calls(monkeypatch, redis, 'set')
+
+    distributor.set_instruments_cache([XBT, ETH])
+
+    assert sets == []
+    assert redis.ttl(key) > 1
+    assert distributor.write_stats == {'sets': 2, 'expires': 2, 'rewrites': 0}
+
+
+def test_changed_values_are_set(redis, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+    moved = XBT._replace(price=6501.0)
+
+    distributor.set_instruments_cache([moved, ETH])
+
+    key, value = distributor.encode_instrument(moved)
+    assert redis.get(key) == as_bytes(value)
+    assert distributor.write_stats == {'sets': 3, 'expires': 1, 'rewrites': 0}
+
+
+def test_keys_expired_between_read_and_expire_are_rewritten(
+        monkeypatch, redis, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+    mget = redis.mget
+
+    def mget_then_expire(keys, *args):
+        values = mget(keys, *args)
+        redis.delete(*keys)
+        return values
+
+    monkeypatch.setattr(redis, 'mget', mget_then_expire)
+    distributor.set_instruments_cache([XBT, ETH])
+
+    for instrument in (XBT, ETH):
+        key, value = distributor.encode_instrument(instrument)
+        assert redis.get(key) == as_bytes(value)
+        assert redis.ttl(key) > 0
+    assert distributor.write_stats == {'sets': 2, 'expires': 2, 'rewrites': 2}
+
+
+def test_unknown_symbol_is_remembered_as_missing(monkeypatch, distributor):
+    assert distributor.get_instrument('XBTUSD') == XBT
+    distributor.local_cache.clear()
+    loads = count_calls(monkeypatch, distributor, 'load_instruments')
+
+    assert distributor.get_instrument('NOSUCH') is None
+    assert distributor.get_instrument('NOSUCH') is None
+    assert len(loads) == 1
+    assert distributor.get_instrument_with_age('NOSUCH') == (None, None)
+
+
+def test_pull_clears_missing_symbols(distributor):
+    distributor.missing.set('XBTUSD', True)
+
+    distributor.pull_active_instruments()
+
+    assert distributor.get_instrument('XBTUSD') == XBT
+
+
+def test_get_instruments_reads_redis_once(monkeypatch, redis, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+    distributor.local_cache.clear()
+    distributor.local_cache.set('XBTUSD', XBT)
+    distributor.missing.set('NOSUCH', True)
+    pipelines = count_calls(monkeypatch, redis, 'pipeline')
+
+    result = distributor.get_instruments(['XBTUSD', 'ETHUSD', 'NOSUCH'])
+
+    assert result == {'XBTUSD': XBT, 'ETHUSD': ETH, 'NOSUCH': None}
+    assert len(pipelines) == 1
+    assert distributor_module.client.calls == 0
+
+
+def test_get_instruments_pulls_symbols_not_in_redis(distributor):
+    result = distributor.get_instruments(['XBTUSD', 'NOSUCH'])
+
+    assert result == {'XBTUSD': XBT, 'NOSUCH': None}
+    assert distributor_module.client.calls == 1
+
+
+def test_diff_is_published_only_by_the_publisher(redis, distributor):
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(distributor.INSTRUMENT_CHANNEL)
+
+    distributor.set_instruments_cache([XBT, ETH])
+    assert pubsub.get_message() is None
+
+    distributor.publisher = True
+    distributor.set_instruments_cache([XBT, ETH])
+    distributor.set_instruments_cache([XBT, ETH])
+    distributor.set_instruments_cache([XBT._replace(price=6501.0)])
+
+    diffs = [codec.decode_json(m['data'])
+             for m in iter(pubsub.get_message, None)]
+    assert len(diffs) == 2
+    assert sorted(s for s, *_ in diffs[0]['changed']) == ['ETHUSD', 'XBTUSD']
+    assert diffs[1] == {
+        'changed': [['XBTUSD', 6501.0, 6499.5, 6500.5]],
+        'removed': ['ETHUSD'],
+    }
+
+
+def test_mirror_applies_published_diffs(distributor):
+    mirror = InstrumentMirror()
+    mirror.handle({'data': codec.encode_json({
+        'changed': [list(XBT), list(ETH)], 'removed': [],
+    })})
+    mirror.handle({'data': codec.encode_json({
+        'changed': [], 'removed': ['ETHUSD'],
+    })})
+
+    assert mirror.get('XBTUSD') == XBT
+    assert 'ETHUSD' not in mirror.instruments
+
+
+def test_pull_keeps_what_the_feed_wrote_meanwhile(monkeypatch, distributor):
+    distributor.set_instruments_cache([XBT, ETH])
+    feed_xbt = XBT._replace(price=6600.0)
+    sol = Instrument('SOLUSD', 20.0, 19.9, 20.1)
+    raw_items = distributor_module.client.get_instrument_active
+
+    def slow_rest_call():
+        rows = raw_items()
+        distributor.set_instruments_cache([feed_xbt, sol], replace=False)
+        distributor.remove_instruments(['ETHUSD'])
+        return rows
+
+    monkeypatch.setattr(
+        distributor_module.client, 'get_instrument_active', slow_rest_call
+    )
+    distributor.pull_active_instruments()
+
+    assert distributor.symbols == {'XBTUSD': feed_xbt, 'SOLUSD': sol}
+    assert distributor.load_instrument('XBTUSD') == feed_xbt
+    assert distributor.load_instrument('ETHUSD') is None
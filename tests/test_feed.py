@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+from psyduck.agent.feed import MarketFeed
+from tests.wsserver import StandInServer
+
+XBT = {'symbol': 'XBTUSD', 'lastPrice': 6500.0,
+       'bidPrice': 6499.5, 'askPrice': 6500.5}
+ETH = {'symbol': 'ETHUSD', 'lastPrice': 450.0,
+       'bidPrice': 449.95, 'askPrice': 450.05}
+
+MESSAGES = [
+    {'info': 'Welcome to the BitMEX Realtime API.'},
+    {'success': True, 'subscribe': 'instrument'},
+    {'table': 'instrument', 'action': 'partial', 'keys': ['symbol'],
+     'data': [XBT, ETH]},
+    {'table': 'instrument', 'action': 'update',
+     'data': [{'symbol': 'XBTUSD', 'lastPrice': 6501.0}]},
+    {'table': 'instrument', 'action': 'delete',
+     'data': [{'symbol': 'ETHUSD'}]},
+]
+
+
+def run_feed(messages, until, **kwargs):
+    changes = []
+    done = threading.Event()
+
+    def on_change(table, action, rows):
+        changes.append((table, action, [dict(row) for row in rows]))
+        if action == until:
+            done.set()
+
+    with StandInServer(messages) as server:
+        feed = MarketFeed(
+            server.url, tables=('instrument',), on_change=on_change,
+            **kwargs
+        )
+        feed.start()
+        try:
+            assert done.wait(5), changes
+        finally:
+            feed.stop()
+    return feed, server, changes
+
+
+def test_feed_applies_partial_update_and_delete():
+    feed, server, changes = run_feed(MESSAGES, 'delete')
+
+    assert server.paths == ['/realtime?subscribe=instrument']
+    assert [(t, a) for t, a, _ in changes] == [
+        ('instrument', 'partial'),
+        ('instrument', 'update'),
+        ('instrument', 'delete'),
+    ]
+    assert feed.get('instrument', 'XBTUSD')['lastPrice'] == 6501.0
+    assert feed.get('instrument', 'XBTUSD')['bidPrice'] == 6499.5
+    assert feed.get('instrument', 'ETHUSD') is None
+
+
+def test_feed_subscribes_per_symbol():
+    feed, server, _ = run_feed(MESSAGES[:3], 'partial', symbols=['XBTUSD'])
+
+    assert server.paths == ['/realtime?subscribe=instrument:XBTUSD']
+
+
+def test_per_symbol_partials_keep_each_other():
+    messages = [
+        {'table': 'instrument', 'action': 'partial', 'keys': ['symbol'],
+         'filter': {'symbol': 'XBTUSD'}, 'data': [XBT]},
+        {'table': 'instrument', 'action': 'partial', 'keys': ['symbol'],
+         'filter': {'symbol': 'ETHUSD'}, 'data': [ETH]},
+        {'table': 'instrument', 'action': 'update',
+         'data': [{'symbol': 'XBTUSD', 'lastPrice': 6501.0}]},
+    ]
+
+    feed, server, _ = run_feed(messages, 'update',
+                               symbols=['XBTUSD', 'ETHUSD'])
+
+    assert server.paths == [
+        '/realtime?subscribe=instrument:XBTUSD,instrument:ETHUSD'
+    ]
+    assert feed.get('instrument', 'XBTUSD')['lastPrice'] == 6501.0
+    assert feed.get('instrument', 'ETHUSD')['lastPrice'] == 450.0
+
+
+def test_filtered_partial_replaces_only_its_rows():
+    feed = MarketFeed('ws://unused')
+    feed.handle(json.dumps({
+        'table': 'instrument', 'action': 'partial', 'keys': ['symbol'],
+        'data': [XBT, ETH],
+    }))
+
+    feed.handle(json.dumps({
+        'table': 'instrument', 'action': 'partial', 'keys': ['symbol'],
+        'filter': {'symbol': 'XBTUSD'},
+        'data': [dict(XBT, lastPrice=6600.0)],
+    }))
+
+    assert feed.get('instrument', 'XBTUSD')['lastPrice'] == 6600.0
+    assert feed.get('instrument', 'ETHUSD')['lastPrice'] == 450.0
+
+
+def test_apply_feed_removes_deleted_instruments(redis, distributor):
+    distributor.publisher = True
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(distributor.INSTRUMENT_CHANNEL)
+
+    feed, _, _ = run_feed(MESSAGES[:3], 'partial')
+    distributor.feed = feed
+    distributor.apply_feed('instrument', 'partial', [XBT, ETH])
+    assert set(distributor.symbols) == {'XBTUSD', 'ETHUSD'}
+
+    distributor.apply_feed('instrument', 'delete', [{'symbol': 'ETHUSD'}])
+
+    assert set(distributor.symbols) == {'XBTUSD'}
+    assert set(distributor.snapshot) == {'XBTUSD'}
+    assert distributor.local_cache.get('ETHUSD') is None
+    assert distributor.load_instrument('ETHUSD') is None
+    assert distributor.load_instrument('XBTUSD').price == 6500.0
+    messages = [pubsub.get_message() for _ in range(3)]
+    data = [m['data'] for m in messages if m]
+    assert b'"removed": ["ETHUSD"]' in data[-1]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from psyduck.client.history import download, split_range
+
+BASE = datetime(2018, 8, 1, tzinfo=timezone.utc)
+
+
+class Adapter(object):
+
+    PAGINATED = ('get_trade',)
+
+    def __init__(self, count, delay=0):
+        self.rows = [
+            {'timestamp': (BASE + timedelta(seconds=i)).strftime(
+                '%Y-%m-%dT%H:%M:%S.%fZ'), 'id': i}
+            for i in range(count)
+        ]
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = set()
+        self.max_active = 0
+
+    def get_trade(self, count, start, start_time, end_time):
+        with self.lock:
+            self.active.add(start_time)
+            self.max_active = max(self.max_active, len(self.active))
+        time.sleep(self.delay)
+        # BitMEX treats endTime as inclusive
+        rows = [row for row in self.rows if start_time <= datetime.strptime(
+            row['timestamp'], '%Y-%m-%dT%H:%M:%S.%fZ'
+        ).replace(tzinfo=timezone.utc) <= end_time]
+        page = rows[start:start + count]
+        if len(page) < count:
+            with self.lock:
+                self.active.discard(start_time)
+        return page
+
+
+def test_split_range_covers_the_range():
+    end = BASE + timedelta(seconds=10)
+
+    bounds = split_range(BASE, end, 3)
+
+    assert bounds[0][0] == BASE and bounds[-1][1] == end
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    assert split_range(BASE, BASE, 4) == []
+
+
+def test_rows_are_complete_ordered_and_unique():
+    adapter = Adapter(1000)
+
+    rows = list(download(adapter.get_trade, BASE,
+                         BASE + timedelta(seconds=1000), shards=7,
+                         workers=3, page_size=50))
+
+    assert [row['id'] for row in rows] == list(range(1000))
+
+
+def test_naive_datetimes_are_utc():
+    adapter = Adapter(10)
+
+    rows = list(download(adapter.get_trade, BASE.replace(tzinfo=None),
+                         (BASE + timedelta(seconds=5)).replace(tzinfo=None),
+                         shards=2, workers=2, page_size=3))
+
+    assert [row['id'] for row in rows] == [0, 1, 2, 3, 4]
+
+
+def test_shards_in_flight_are_bounded():
+    adapter = Adapter(400, delay=0.002)
+
+    rows = list(download(adapter.get_trade, BASE,
+                         BASE + timedelta(seconds=400), shards=20,
+                         workers=2, buffer=10, page_size=10))
+
+    assert len(rows) == 400
+    assert adapter.max_active <= 2
+
+
+def test_worker_errors_are_raised():
+    class Broken(Adapter):
+        def get_trade(self, **kwargs):
+            raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        list(download(Broken(0).get_trade, BASE,
+                      BASE + timedelta(seconds=10)))
+
+
+def test_closing_early_stops_the_workers():
+    adapter = Adapter(1000)
+    rows = download(adapter.get_trade, BASE, BASE + timedelta(seconds=1000),
+                    shards=4, workers=4, buffer=5, page_size=10)
+
+    assert next(rows)['id'] == 0
+    rows.close()
+
+    time.sleep(0.3)
+    assert not [t for t in threading.enumerate()
+                if t.name.startswith('ThreadPoolExecutor') and t.is_alive()]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from psyduck.agent.orderbook import BUY, SELL, OrderBook, OrderBooks
+
+
+def level(id, side, price, size, symbol='XBTUSD'):
+    return {'symbol': symbol, 'id': id, 'side': side, 'price': price,
+            'size': size}
+
+
+SNAPSHOT = [
+    level(1, SELL, 6502.0, 300),
+    level(2, SELL, 6501.0, 200),
+    level(3, BUY, 6500.0, 100),
+    level(4, BUY, 6499.5, 400),
+]
+
+
+def test_snapshot_best_and_depth():
+    book = OrderBook.from_snapshot('XBTUSD', SNAPSHOT)
+
+    assert book.best_bid == (6500.0, 100)
+    assert book.best_ask == (6501.0, 200)
+    assert book.depth(1) == ([(6500.0, 100)], [(6501.0, 200)])
+    assert book.depth(5) == (
+        [(6500.0, 100), (6499.5, 400)],
+        [(6501.0, 200), (6502.0, 300)],
+    )
+    assert book.depth(0) == ([], [])
+
+
+def test_insert_update_delete():
+    book = OrderBook.from_snapshot('XBTUSD', SNAPSHOT)
+
+    book.apply('insert', [level(5, BUY, 6500.5, 50)])
+    assert book.best_bid == (6500.5, 50)
+
+    book.apply('update', [{'symbol': 'XBTUSD', 'id': 2, 'side': SELL,
+                           'size': 250}])
+    assert book.best_ask == (6501.0, 250)
+
+    book.apply('delete', [{'symbol': 'XBTUSD', 'id': 5, 'side': BUY}])
+    book.apply('delete', [{'symbol': 'XBTUSD', 'id': 2, 'side': SELL}])
+    assert book.best_bid == (6500.0, 100)
+    assert book.best_ask == (6502.0, 300)
+
+    book.apply('delete', [{'symbol': 'XBTUSD', 'id': 99, 'side': SELL}])
+    assert len(book.levels) == 3
+
+
+def test_update_of_unknown_level_with_price_inserts():
+    book = OrderBook('XBTUSD')
+
+    book.apply('update', [level(7, SELL, 6503.0, 10)])
+    book.apply('update', [{'symbol': 'XBTUSD', 'id': 8, 'side': SELL,
+                           'size': 5}])
+
+    assert book.best_ask == (6503.0, 10)
+    assert list(book.levels) == [7]
+
+
+def test_partial_replaces_book():
+    book = OrderBook.from_snapshot('XBTUSD', SNAPSHOT)
+
+    book.apply('partial', [level(9, BUY, 6400.0, 1)])
+
+    assert book.best_bid == (6400.0, 1)
+    assert book.best_ask is None
+
+
+def test_order_books_route_rows_by_symbol():
+    books = OrderBooks()
+
+    books.handle('orderBookL2', 'partial', SNAPSHOT + [
+        level(10, BUY, 450.0, 7, symbol='ETHUSD'),
+    ])
+    books.handle('quote', 'insert', [level(11, BUY, 1.0, 1)])
+
+    assert books.get('XBTUSD').best_bid == (6500.0, 100)
+    assert books.get('ETHUSD').best_bid == (450.0, 7)
+    assert books.get('ETHUSD').best_ask is None
+
+
+def test_seed_uses_full_depth_snapshot():
+    class Client(object):
+        def get_order_book_l2(self, symbol, depth):
+            assert (symbol, depth) == ('XBTUSD', 0)
+            return SNAPSHOT
+
+    book = OrderBooks().seed(Client(), 'XBTUSD')
+
+    assert book.best_ask == (6501.0, 200)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from psyduck.client.paginate import paginate
+
+
+class Adapter(object):
+
+    PAGINATED = ('get_trade',)
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get_trade(self, count, start, **kwargs):
+        self.calls.append((count, start, kwargs))
+        return self.rows[start:start + count]
+
+    def get_position(self, count=None, start=None):
+        return []
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_yields_every_row_in_order(prefetch):
+    adapter = Adapter(list(range(23)))
+
+    rows = list(paginate(adapter.get_trade, page_size=5, prefetch=prefetch,
+                         symbol='XBTUSD'))
+
+    assert rows == list(range(23))
+    assert [c[1] for c in adapter.calls] == [0, 5, 10, 15, 20]
+    assert all(c[2] == {'symbol': 'XBTUSD'} for c in adapter.calls)
+
+
+def test_full_last_page_costs_one_empty_request():
+    adapter = Adapter(list(range(10)))
+
+    assert list(paginate(adapter.get_trade, page_size=5)) == list(range(10))
+    assert [c[1] for c in adapter.calls] == [0, 5, 10]
+
+
+def test_start_offset():
+    adapter = Adapter(list(range(10)))
+
+    assert list(paginate(adapter.get_trade, page_size=4, start=7)) == \
+        [7, 8, 9]
+
+
+def test_is_lazy():
+    adapter = Adapter(list(range(100)))
+
+    rows = paginate(adapter.get_trade, page_size=10, prefetch=False)
+    assert next(rows) == 0
+    assert len(adapter.calls) == 1
+    rows.close()
+
+
+def test_rejects_unpaginated_methods():
+    with pytest.raises(ValueError):
+        next(paginate(Adapter([]).get_position))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+from psyduck.agent.singleflight import SingleFlight
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+
+    def call():
+        return flight.do('key', fn)
+
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    results = run_concurrently(10, call)
+
+    assert results == ['value'] * 10
+    assert len(calls) == 1
+    assert not flight.in_flight('key')
+
+
+def test_exceptions_are_shared():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    results = run_concurrently(5, lambda: flight.do('key', fn))
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not flight.in_flight('key')
+
+
+def test_keys_are_independent_and_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    def fn(name, suffix=''):
+        calls.append(name)
+        return name + suffix
+
+    assert flight.do('a', fn, 'a') == 'a'
+    assert flight.do('b', fn, 'b', suffix='!') == 'b!'
+    assert flight.do('a', fn, 'a') == 'a'
+    assert calls == ['a', 'b', 'a']
+
+
+def test_in_flight():
+    flight = SingleFlight()
+    seen = []
+
+    flight.do('key', lambda: seen.append(flight.in_flight('key')))
+
+    assert seen == [True]
+    with pytest.raises(ValueError):
+        flight.do('key', int, 'x')
+    assert not flight.in_flight('key')
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+
+GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class StandInServer(object):
+    """Local stand-in for the BitMEX realtime endpoint
+
+    Accepts WebSocket clients on 127.0.0.1 and sends each of them
+    `messages` as text frames, then keeps the connection open until the
+    client goes away or the server is stopped.
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.paths = []
+        self.connected = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(4)
+        self.clients = []
+        self.thread = None
+
+    @property
+    def url(self):
+        return 'ws://127.0.0.1:{}/realtime'.format(self.sock.getsockname()[1])
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.accept, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stop(self):
+        for conn in self.clients:
+            conn.close()
+        self.sock.close()
+
+    def accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.clients.append(conn)
+            threading.Thread(
+                target=self.serve, args=(conn,), daemon=True
+            ).start()
+
+    def serve(self, conn):
+        try:
+            self.handshake(conn)
+            self.connected.set()
+            for message in self.messages:
+                conn.sendall(frame(json.dumps(message)))
+            while True:
+                data = conn.recv(1024)
+                # answer a close frame so the client does not wait for it
+                if not data or data[0] & 0x0f == 0x8:
+                    conn.sendall(b'\x88\x00')
+                    conn.close()
+                    return
+        except OSError:
+            pass
+
+    def handshake(self, conn):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = conn.recv(1024)
+            if not chunk:
+                raise OSError('client went away')
+            request += chunk
+        lines = request.decode('latin-1').split('\r\n')
+        self.paths.append(lines[0].split(' ')[1])
+        headers = dict(
+            line.split(': ', 1) for line in lines[1:] if ': ' in line
+        )
+        key = headers['Sec-WebSocket-Key'] + GUID
+        accept = base64.b64encode(hashlib.sha1(key.encode()).digest())
+        conn.sendall(
+            b'HTTP/1.1 101 Switching Protocols\r\n'
+            b'Upgrade: websocket\r\n'
+            b'Connection: Upgrade\r\n'
+            b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+        )
+
+
+def frame(text):
+    payload = text.encode('utf-8')
+    size = len(payload)
+    if size < 126:
+        header = struct.pack('!BB', 0x81, size)
+    elif size < 1 << 16:
+        header = struct.pack('!BBH', 0x81, 126, size)
+    else:
+        header = struct.pack('!BBQ', 0x81, 127, size)
+    return header + payload